@@ -5,17 +5,38 @@ Provides shared instances for use across API endpoints,
 ensuring consistent lifecycle management and testability.
 """
 
+from functools import lru_cache
+
+from fastapi import Depends
+
 from app.domain.metadata_service import MetadataService
-from app.infrastructure.db.repository import MetadataRepository
+from app.infrastructure.db.repository import MetadataRepository, get_repository
+
+
+async def get_metadata_repository() -> MetadataRepository:
+    """Provide the MetadataRepository shared with the consumer and worker."""
+    return get_repository()
 
 
-def get_metadata_service() -> MetadataService:
+@lru_cache(maxsize=1)
+def _build_metadata_service(repository: MetadataRepository) -> MetadataService:
+    """Build the MetadataService for a repository, once per repository."""
+    return MetadataService(repository=repository)
+
+
+async def get_metadata_service(
+    repository: MetadataRepository = Depends(get_metadata_repository),
+) -> MetadataService:
     """
     Provide a MetadataService instance with its dependencies.
 
     This is registered as a FastAPI dependency so endpoints
     receive a fully-wired service without coupling to
-    infrastructure details.
+    infrastructure details. A single instance is built per
+    repository and shared across requests, so the repository's
+    read cache and write batching are shared too. Both
+    dependencies are async, so FastAPI resolves them on the event
+    loop rather than through its threadpool. Tests can swap the
+    repository via app.dependency_overrides.
     """
-    repository = MetadataRepository()
-    return MetadataService(repository=repository)
+    return _build_metadata_service(repository)
@@ -6,7 +6,10 @@ and retrieval. Uses FastAPI dependency injection for clean
 separation from business logic.
 """
 
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 
 from app.api.dependencies import get_metadata_service
 from app.api.schemas import (
@@ -16,17 +19,40 @@ from app.api.schemas import (
     ErrorResponse,
 )
 from app.core.exceptions import CollectionError, UrlValidationError
-from app.core.logging import get_logger
+from app.core.logging import get_logger, should_log_traceback
 from app.domain.metadata_service import MetadataService
+from app.domain.models import MetadataRecord
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/metadata", tags=["Metadata"])
 
+_ACCEPTED_MESSAGE = MetadataAccepted.model_fields["message"].default
+
+
+def _to_response_payload(record: MetadataRecord) -> dict[str, Any]:
+    """
+    Shape a MetadataRecord into the MetadataResponse JSON layout.
+
+    The record is already validated, so the payload is built as a plain
+    dict and serialised directly instead of round-tripping through a
+    MetadataResponse model on every request.
+    """
+    return {
+        "id": record.id or "",
+        "url": record.url,
+        "headers": record.headers,
+        "cookies": record.cookies,
+        "page_source": record.page_source,
+        "status_code": record.status_code,
+        "status": record.status,
+        "collected_at": record.updated_at,
+    }
+
 
 @router.post(
     "",
-    response_model=MetadataResponse,
+    response_model=None,
     status_code=status.HTTP_201_CREATED,
     summary="Collect and store URL metadata",
     description=(
@@ -34,6 +60,7 @@ router = APIRouter(prefix="/metadata", tags=["Metadata"])
         "and stores them in the database. Returns the complete metadata record."
     ),
     responses={
+        201: {"model": MetadataResponse, "description": "Metadata collected"},
         400: {"model": ErrorResponse, "description": "Invalid URL"},
         500: {"model": ErrorResponse, "description": "Collection failed"},
     },
@@ -41,7 +68,7 @@ router = APIRouter(prefix="/metadata", tags=["Metadata"])
 async def create_metadata(
     request: MetadataRequest,
     service: MetadataService = Depends(get_metadata_service),
-) -> MetadataResponse:
+) -> ORJSONResponse:
     """
     POST /metadata — Create a metadata record for a given URL.
 
@@ -50,15 +77,9 @@ async def create_metadata(
     """
     try:
         record = await service.create_metadata(str(request.url))
-        return MetadataResponse(
-            id=record.id or "",
-            url=record.url,
-            headers=record.headers,
-            cookies=record.cookies,
-            page_source=record.page_source,
-            status_code=record.status_code,
-            status=record.status,
-            collected_at=record.updated_at,
+        return ORJSONResponse(
+            status_code=status.HTTP_201_CREATED,
+            content=_to_response_payload(record),
         )
 
     except CollectionError as exc:
@@ -75,7 +96,11 @@ async def create_metadata(
         ) from exc
 
     except Exception as exc:
-        logger.error("Unexpected error in create_metadata: %s", exc, exc_info=True)
+        logger.error(
+            "Unexpected error in create_metadata: %s",
+            exc,
+            exc_info=should_log_traceback("create_metadata"),
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while collecting metadata.",
@@ -120,28 +145,24 @@ async def get_metadata(
         record, found = await service.get_metadata(url)
 
         if found and record:
-            return MetadataResponse(
-                id=record.id or "",
-                url=record.url,
-                headers=record.headers,
-                cookies=record.cookies,
-                page_source=record.page_source,
-                status_code=record.status_code,
-                status=record.status,
-                collected_at=record.updated_at,
-            )
+            return ORJSONResponse(content=_to_response_payload(record))
 
         # Cache miss — return 202 Accepted
-        from fastapi.responses import JSONResponse
-
-        accepted = MetadataAccepted(url=url, status="pending")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=accepted.model_dump(),
+            content={
+                "url": url,
+                "status": "pending",
+                "message": _ACCEPTED_MESSAGE,
+            },
         )
 
     except Exception as exc:
-        logger.error("Unexpected error in get_metadata: %s", exc, exc_info=True)
+        logger.error(
+            "Unexpected error in get_metadata: %s",
+            exc,
+            exc_info=should_log_traceback("get_metadata"),
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while retrieving metadata.",
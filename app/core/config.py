@@ -21,6 +21,30 @@ class Settings(BaseSettings):
         default="metadata_service",
         description="MongoDB database name",
     )
+    mongo_pending_batch_size: int = Field(
+        default=256,
+        description="Max pending-marks merged into one MongoDB bulk write",
+    )
+    mongo_pending_linger_ms: int = Field(
+        default=10,
+        description="How long pending-marks wait to be merged before writing",
+    )
+    mongo_upsert_batch_size: int = Field(
+        default=200,
+        description="Max worker upserts merged into one MongoDB bulk write",
+    )
+    mongo_upsert_linger_ms: int = Field(
+        default=10,
+        description="How long worker upserts wait to be merged before writing",
+    )
+    mongo_read_cache_size: int = Field(
+        default=10_000,
+        description="Max completed records kept in the in-process read cache",
+    )
+    mongo_read_cache_ttl_seconds: float = Field(
+        default=60.0,
+        description="How long a cached record is served before re-reading it",
+    )
 
     # HTTP Client (for crawling URLs)
     http_timeout: int = Field(
@@ -59,6 +83,33 @@ class Settings(BaseSettings):
         default=3,
         description="Max retry attempts before sending message to DLQ",
     )
+    kafka_consume_batch_size: int = Field(
+        default=500,
+        description="Max Kafka messages pulled by one consume() call",
+    )
+    kafka_consumer_concurrency: int = Field(
+        default=32,
+        description="Max Kafka messages processed concurrently per consumer",
+    )
+    kafka_max_outstanding_messages: int = Field(
+        default=1000,
+        description=(
+            "Consumed but unfinished Kafka messages above which the consumer "
+            "pauses fetching; it resumes once half of them have finished"
+        ),
+    )
+    kafka_commit_interval_ms: int = Field(
+        default=5000,
+        description="How often librdkafka auto-commits stored consumer offsets",
+    )
+    kafka_enqueue_batch_size: int = Field(
+        default=500,
+        description="Max URLs coalesced into one producer flush",
+    )
+    kafka_enqueue_linger_ms: int = Field(
+        default=5,
+        description="How long enqueued URLs wait to be coalesced before producing",
+    )
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -15,12 +15,24 @@ class MetadataServiceError(Exception):
 
 
 class CollectionError(MetadataServiceError):
-    """Raised when URL metadata collection fails."""
+    """
+    Raised when URL metadata collection fails.
+
+    The human-readable message is built lazily, since many of these
+    errors are caught and classified without ever being rendered.
+    """
 
     def __init__(self, url: str, reason: str = "Unknown error"):
         self.url = url
         self.reason = reason
-        super().__init__(f"Failed to collect metadata for '{url}': {reason}")
+        Exception.__init__(self, url, reason)
+
+    @property
+    def message(self) -> str:
+        return f"Failed to collect metadata for '{self.url}': {self.reason}"
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class PermanentCollectionError(CollectionError):
@@ -4,6 +4,7 @@ FastAPI application lifespan management.
 Handles startup and shutdown of all long-lived resources:
   - MongoDB connection
   - Database indexes
+  - Shared HTTP client
   - Kafka producer and consumer
   - Logging setup
 """
@@ -14,20 +15,30 @@ from typing import AsyncIterator
 from fastapi import FastAPI
 
 from app.core.logging import setup_logging, get_logger
+from app.domain.metadata_service import drain_background_tasks
+from app.infrastructure.crawler.http_client import (
+    init_http_client,
+    close_http_client,
+)
 from app.infrastructure.db.mongo import (
     connect_to_mongo,
     close_mongo,
     ensure_indexes,
 )
+from app.infrastructure.db.repository import get_repository
 from app.infrastructure.messaging.producer import (
     init_producer,
     close_producer,
     ensure_topics,
+    stop_enqueue_batcher,
 )
 from app.infrastructure.messaging.consumer import start_consumer, stop_consumer
 
 logger = get_logger(__name__)
 
+# How long shutdown waits for GET-scheduled collections to be enqueued
+_BACKGROUND_DRAIN_TIMEOUT_SECONDS = 10.0
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
@@ -38,13 +49,15 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
       1. Configure structured logging
       2. Connect to MongoDB with retry-backoff
       3. Create database indexes
-      4. Initialize Kafka producer
-      5. Start Kafka consumer task
+      4. Initialize shared HTTP client
+      5. Initialize Kafka producer
+      6. Start Kafka consumer task
 
     Shutdown:
       1. Stop Kafka consumer
-      2. Close Kafka producer (flush pending messages)
-      3. Close MongoDB connection
+      2. Close Kafka producer (flush batched and pending messages)
+      3. Close shared HTTP client
+      4. Flush batched MongoDB writes and close the connection
     """
     # ── Startup ──────────────────────────────────────────────
     setup_logging()
@@ -54,6 +67,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     await ensure_indexes()
     logger.info("MongoDB connected and indexes ensured")
 
+    init_http_client()
+
     ensure_topics()
     logger.info("Kafka topics ensured")
 
@@ -68,6 +83,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # ── Shutdown ─────────────────────────────────────────────
     logger.info("Shutting down metadata service...")
     await stop_consumer()
+    await drain_background_tasks(_BACKGROUND_DRAIN_TIMEOUT_SECONDS)
+    await stop_enqueue_batcher()
     close_producer()
+    await close_http_client()
+    await get_repository().close()
     await close_mongo()
     logger.info("Shutdown complete")
@@ -7,8 +7,16 @@ across all application modules.
 
 import logging
 import sys
+import time
+
 from app.core.config import settings
 
+# Minimum seconds between full tracebacks for the same error site
+TRACEBACK_LOG_INTERVAL_SECONDS = 60.0
+
+# error site → monotonic time its last traceback was logged
+_last_traceback_at: dict[str, float] = {}
+
 
 def setup_logging() -> None:
     """Configure application-wide structured logging."""
@@ -33,3 +41,20 @@ def setup_logging() -> None:
 def get_logger(name: str) -> logging.Logger:
     """Return a named logger with the application's configuration."""
     return logging.getLogger(name)
+
+
+def should_log_traceback(site: str) -> bool:
+    """
+    Rate-limit traceback capture for an error site.
+
+    Formatting a traceback is expensive, and unexpected errors tend to
+    arrive in bursts. Returns True at most once per
+    TRACEBACK_LOG_INTERVAL_SECONDS for each site, so callers can pass
+    the result as ``exc_info`` and still log every occurrence's message.
+    """
+    now = time.monotonic()
+    last = _last_traceback_at.get(site)
+    if last is not None and now - last < TRACEBACK_LOG_INTERVAL_SECONDS:
+        return False
+    _last_traceback_at[site] = now
+    return True
@@ -6,24 +6,65 @@ URL metadata. This layer is framework-agnostic and depends only
 on the repository and infrastructure abstractions.
 """
 
-from typing import Optional
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
 
 from app.core.exceptions import CollectionError
 from app.core.logging import get_logger
 from app.domain.models import MetadataRecord
-from app.infrastructure.crawler.http_client import fetch_url
+from app.infrastructure.crawler.http_client import CollectedData, fetch_url
 from app.infrastructure.db.repository import MetadataRepository
 from app.infrastructure.messaging.producer import enqueue
 from app.utils.url_normalizer import normalize_url
 
 logger = get_logger(__name__)
 
+# Strong references to in-flight background tasks so they are not
+# garbage-collected before completion
+_background_tasks: set[asyncio.Task] = set()
+
+# How long a scheduled URL suppresses further scheduling from this process
+SCHEDULE_DEDUP_TTL_SECONDS = 30.0
+
+# Size above which expired entries are pruned from the dedup map
+_SCHEDULE_DEDUP_PRUNE_THRESHOLD = 10_000
+
+
+async def drain_background_tasks(timeout: float) -> None:
+    """
+    Wait for in-flight background scheduling tasks to finish.
+
+    Called during shutdown, before the enqueue batcher and Kafka
+    producer are closed, so URLs already marked pending still get
+    enqueued. Tasks still running after ``timeout`` seconds are
+    cancelled.
+    """
+    if not _background_tasks:
+        return
+    _, pending = await asyncio.wait(set(_background_tasks), timeout=timeout)
+    if pending:
+        logger.warning(
+            "Cancelling %d background collection task(s) still running at shutdown",
+            len(pending),
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
 
 class MetadataService:
     """Business logic for URL metadata operations."""
 
-    def __init__(self, repository: MetadataRepository) -> None:
+    def __init__(
+        self,
+        repository: MetadataRepository,
+        fetcher: Optional[Callable[[str], Awaitable[CollectedData]]] = None,
+    ) -> None:
         self._repo = repository
+        self._fetch = fetcher or fetch_url
+        # url → monotonic time its background collection was scheduled
+        self._recently_scheduled: dict[str, float] = {}
 
     async def create_metadata(self, raw_url: str) -> MetadataRecord:
         """
@@ -32,7 +73,7 @@ class MetadataService:
         This is the POST endpoint logic:
           1. Normalise the URL
           2. Fetch headers, cookies, and page source via HTTP
-          3. Upsert the record into MongoDB
+          3. Upsert the record into MongoDB (single round-trip)
           4. Return the complete metadata record
 
         Args:
@@ -45,10 +86,10 @@ class MetadataService:
             CollectionError: If the URL cannot be fetched.
         """
         url = normalize_url(raw_url)
-        logger.info("Creating metadata for url=%s (normalised from %s)", url, raw_url)
+        logger.debug("Creating metadata for url=%s (normalised from %s)", url, raw_url)
 
         # Fetch the URL metadata
-        collected = await fetch_url(url)
+        collected = await self._fetch(url)
 
         # Prepare the document payload
         data = {
@@ -58,11 +99,8 @@ class MetadataService:
             "status_code": collected.status_code,
         }
 
-        # Upsert into the database
-        doc_id = await self._repo.upsert(url, data)
-
-        # Retrieve and return the full record
-        doc = await self._repo.find_by_url(url)
+        # Upsert into the database and return the stored record
+        doc = await self._repo.upsert_returning(url, data)
         return MetadataRecord.from_mongo(doc)
 
     async def get_metadata(self, raw_url: str) -> tuple[Optional[MetadataRecord], bool]:
@@ -71,10 +109,10 @@ class MetadataService:
 
         This is the GET endpoint logic:
           1. Normalise the URL
-          2. Look up in the database
+          2. Look up the record's status in the database
           3a. If found and completed → return the record
-          3b. If not found or not completed → enqueue for background
-              collection and return None
+          3b. If not found or not completed → schedule background
+              collection (without waiting on it) and return None
 
         Args:
             raw_url: The original URL from the user.
@@ -84,18 +122,64 @@ class MetadataService:
             If was_found is False, a background collection has been scheduled.
         """
         url = normalize_url(raw_url)
-        logger.info("Getting metadata for url=%s (normalised from %s)", url, raw_url)
+        logger.debug("Getting metadata for url=%s (normalised from %s)", url, raw_url)
 
-        # Check the database
-        doc = await self._repo.find_by_url(url)
+        # Probe the status first; only load the full document on a hit
+        if await self._repo.find_status(url) == "completed":
+            doc = await self._repo.find_by_url(url)
+            if doc and doc.get("status") == "completed":
+                logger.debug("Cache HIT for url=%s", url)
+                return MetadataRecord.from_mongo(doc), True
 
-        if doc and doc.get("status") == "completed":
-            logger.info("Cache HIT for url=%s", url)
-            return MetadataRecord.from_mongo(doc), True
+        # Cache miss — only the first concurrent miss per URL schedules work
+        if not self._claim_schedule(url):
+            logger.debug("Cache MISS for url=%s, collection already scheduled", url)
+            return None, False
 
-        # Cache miss — schedule background collection
+        # Schedule background collection off the request path
         logger.info("Cache MISS for url=%s, scheduling background collection", url)
-        was_marked = await self._repo.mark_pending(url)
+        task = asyncio.create_task(self._schedule_collection(url))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+        return None, False
+
+    def _claim_schedule(self, url: str) -> bool:
+        """
+        Single-flight guard for background scheduling.
+
+        Returns True if the caller should schedule collection for the URL,
+        or False if this process already did so within the dedup TTL.
+        There is no await between the check and the update, so the claim
+        is atomic with respect to other coroutines.
+        """
+        now = time.monotonic()
+        scheduled_at = self._recently_scheduled.get(url)
+        if scheduled_at is not None and now - scheduled_at < SCHEDULE_DEDUP_TTL_SECONDS:
+            return False
+
+        if len(self._recently_scheduled) >= _SCHEDULE_DEDUP_PRUNE_THRESHOLD:
+            cutoff = now - SCHEDULE_DEDUP_TTL_SECONDS
+            self._recently_scheduled = {
+                u: t for u, t in self._recently_scheduled.items() if t >= cutoff
+            }
+
+        self._recently_scheduled[url] = now
+        return True
+
+    async def _schedule_collection(self, url: str) -> None:
+        """
+        Mark a URL as pending and enqueue it for the worker.
+
+        Runs as a background task so the GET response does not wait on
+        the MongoDB write or the Kafka produce. Failures are logged
+        rather than raised, since the client has already been answered.
+        """
+        try:
+            was_marked = await self._repo.mark_pending(url)
+        except Exception as exc:
+            logger.error("Failed to mark url=%s as pending: %s", url, exc)
+            return
 
         if was_marked:
             try:
@@ -103,9 +187,9 @@ class MetadataService:
             except Exception as exc:
                 logger.error(
                     "Failed to enqueue url=%s: %s. "
-                    "The pending record will be retried by the worker.",
+                    "Marking it failed so a later GET schedules it again.",
                     url,
                     exc,
                 )
-
-        return None, False
+                # A pending record is never re-marked, so release it
+                await self._repo.mark_failed(url, f"Failed to enqueue: {exc}")
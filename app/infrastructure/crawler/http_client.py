@@ -1,16 +1,22 @@
 """
 HTTP client for crawling URL metadata.
 
-Uses httpx.AsyncClient for non-blocking HTTP requests with
-connection pooling, configurable timeouts, and classified error handling.
+Uses a single shared httpx.AsyncClient for non-blocking HTTP requests,
+so keep-alive connections and TLS sessions are reused across fetches.
+The client is created during application startup and closed on shutdown.
 
 Errors are classified as:
   - PermanentCollectionError: 4xx, DNS not found, TLS errors (no retry)
   - TransientCollectionError: 5xx, timeouts, connection resets (retry)
 """
 
+import logging
+import re
+
 import httpx
 from dataclasses import dataclass, field
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Optional
 
 from app.core.config import settings
 from app.core.exceptions import (
@@ -28,8 +34,42 @@ PERMANENT_STATUS_CODES = {400, 401, 403, 404, 405, 406, 410, 414, 451}
 # HTTP status codes that indicate transient failure (worth retrying)
 TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
 
+# Status-code lookup table: one indexed read classifies a response
+_STATUS_PERMANENT = 1
+_STATUS_TRANSIENT = 2
+_STATUS_CLASS = bytearray(600)
+for _code in PERMANENT_STATUS_CODES:
+    _STATUS_CLASS[_code] = _STATUS_PERMANENT
+for _code in TRANSIENT_STATUS_CODES:
+    _STATUS_CLASS[_code] = _STATUS_TRANSIENT
+del _code
+
+
+def _classify_status(status_code: int) -> int:
+    """Return _STATUS_PERMANENT, _STATUS_TRANSIENT, or 0 for a status code."""
+    return _STATUS_CLASS[status_code] if 0 <= status_code < 600 else 0
+
+
+# Connect-error messages that mean the domain does not resolve (permanent)
+_DNS_FAILURE_RE = re.compile(
+    r"name or service not known"
+    r"|nodename nor servname"
+    r"|no address associated"
+    r"|getaddrinfo failed",
+    re.IGNORECASE,
+)
+
+# Timeout policy for outbound fetches (built once, reused by the client)
+_TIMEOUT = httpx.Timeout(timeout=settings.http_timeout, connect=10.0)
+
+# Redirects followed per fetch before giving up
+_MAX_REDIRECTS = 10
 
-@dataclass
+# Module-level client reference (shared connection pool)
+_client: Optional[httpx.AsyncClient] = None
+
+
+@dataclass(frozen=True, slots=True)
 class CollectedData:
     """Structured result of a URL metadata collection."""
 
@@ -39,6 +79,60 @@ class CollectedData:
     status_code: int = 0
 
 
+def init_http_client() -> None:
+    """
+    Initialize the shared HTTP client.
+
+    Called once during application startup (lifespan).
+    """
+    global _client
+    _client = httpx.AsyncClient(
+        timeout=_TIMEOUT,
+        # Never persist cookies between fetches of unrelated URLs; cookies
+        # within one redirect chain are carried by _get_with_redirects
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=100,
+            keepalive_expiry=30,
+        ),
+    )
+    logger.info("HTTP client initialized")
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("HTTP client closed")
+
+
+async def _get_with_redirects(url: str) -> httpx.Response:
+    """
+    GET a URL, following redirects with a cookie jar private to this fetch.
+
+    The shared client stores no cookies, so cookies set earlier in a
+    redirect chain are replayed from here instead, as a per-fetch client
+    would, without leaking into unrelated fetches.
+    """
+    cookies = httpx.Cookies()
+    response = await _client.get(url, follow_redirects=False)
+    redirects = 0
+    while response.next_request is not None:
+        if redirects == _MAX_REDIRECTS:
+            raise httpx.TooManyRedirects(
+                "Exceeded maximum allowed redirects.", request=response.request
+            )
+        redirects += 1
+        cookies.extract_cookies(response)
+        request = response.next_request
+        cookies.set_cookie_header(request)
+        response = await _client.send(request, follow_redirects=False)
+    return response
+
+
 async def fetch_url(url: str) -> CollectedData:
     """
     Fetch metadata (headers, cookies, page source) from a URL.
@@ -54,45 +148,42 @@ async def fetch_url(url: str) -> CollectedData:
         TransientCollectionError: For retryable failures (5xx, timeouts).
         CollectionError: For unclassified failures.
     """
-    timeout = httpx.Timeout(
-        timeout=settings.http_timeout,
-        connect=10.0,
-    )
+    if _client is None:
+        raise RuntimeError(
+            "HTTP client is not initialized. "
+            "Ensure init_http_client() was called during startup."
+        )
 
     try:
-        async with httpx.AsyncClient(
-            timeout=timeout,
-            follow_redirects=True,
-            max_redirects=10,
-        ) as client:
-            logger.info("Fetching url=%s", url)
-            response = await client.get(url)
-
-            # Classify HTTP status codes
-            if response.status_code in PERMANENT_STATUS_CODES:
-                raise PermanentCollectionError(
-                    url,
-                    f"HTTP {response.status_code} — permanent failure",
-                )
-
-            if response.status_code in TRANSIENT_STATUS_CODES:
-                raise TransientCollectionError(
-                    url,
-                    f"HTTP {response.status_code} — server error, retryable",
-                )
-
-            # Extract headers as a flat dict
-            headers = dict(response.headers)
-
-            # Extract cookies as a flat dict
-            cookies = {
-                name: value
-                for name, value in response.cookies.items()
-            }
-
-            # Page source (body text)
-            page_source = response.text
+        logger.debug("Fetching url=%s", url)
+        response = await _get_with_redirects(url)
+
+        # Classify HTTP status codes
+        status_class = _classify_status(response.status_code)
+        if status_class == _STATUS_PERMANENT:
+            raise PermanentCollectionError(
+                url,
+                f"HTTP {response.status_code} — permanent failure",
+            )
+
+        if status_class == _STATUS_TRANSIENT:
+            raise TransientCollectionError(
+                url,
+                f"HTTP {response.status_code} — server error, retryable",
+            )
 
+        # Extract headers as a flat dict (repeated headers are comma-joined)
+        headers = dict(response.headers)
+
+        # Extract cookies as a flat dict
+        cookies = dict(response.cookies)
+
+        # Page source — decode the body bytes once
+        page_source = response.content.decode(
+            response.encoding or "utf-8", errors="replace"
+        )
+
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
                 "Successfully fetched url=%s (status=%d, size=%d bytes)",
                 url,
@@ -100,12 +191,12 @@ async def fetch_url(url: str) -> CollectedData:
                 len(page_source),
             )
 
-            return CollectedData(
-                headers=headers,
-                cookies=cookies,
-                page_source=page_source,
-                status_code=response.status_code,
-            )
+        return CollectedData(
+            headers=headers,
+            cookies=cookies,
+            page_source=page_source,
+            status_code=response.status_code,
+        )
 
     except (PermanentCollectionError, TransientCollectionError):
         # Re-raise classified errors without wrapping
@@ -122,12 +213,8 @@ async def fetch_url(url: str) -> CollectedData:
         raise PermanentCollectionError(url, "Too many redirects") from exc
 
     except httpx.ConnectError as exc:
-        error_str = str(exc).lower()
         # DNS resolution failure for non-existent domains → permanent
-        if "name or service not known" in error_str or \
-           "nodename nor servname" in error_str or \
-           "no address associated" in error_str or \
-           "getaddrinfo failed" in error_str:
+        if _DNS_FAILURE_RE.search(str(exc)):
             logger.warning("DNS resolution failed for url=%s: %s", url, exc)
             raise PermanentCollectionError(
                 url, f"DNS resolution failed — domain does not exist: {exc}"
@@ -141,9 +228,10 @@ async def fetch_url(url: str) -> CollectedData:
 
     except httpx.HTTPStatusError as exc:
         status = exc.response.status_code
-        if status in PERMANENT_STATUS_CODES:
+        status_class = _classify_status(status)
+        if status_class == _STATUS_PERMANENT:
             raise PermanentCollectionError(url, f"HTTP {status}") from exc
-        elif status in TRANSIENT_STATUS_CODES:
+        elif status_class == _STATUS_TRANSIENT:
             raise TransientCollectionError(url, f"HTTP {status}") from exc
         else:
             raise CollectionError(url, f"HTTP {status}") from exc
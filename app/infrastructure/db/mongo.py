@@ -18,6 +18,9 @@ logger = get_logger(__name__)
 _client: AsyncIOMotorClient | None = None
 _database: AsyncIOMotorDatabase | None = None
 
+# Name of the unique index on `url`, referenced by query hints
+URL_INDEX_NAME = "idx_url_unique"
+
 
 async def connect_to_mongo(
     max_retries: int = 5, base_delay: float = 1.0
@@ -108,6 +111,6 @@ async def ensure_indexes() -> None:
     db = get_database()
     collection = db.metadata
 
-    await collection.create_index("url", unique=True, name="idx_url_unique")
+    await collection.create_index("url", unique=True, name=URL_INDEX_NAME)
     await collection.create_index("status", name="idx_status")
     logger.info("Database indexes ensured on 'metadata' collection")
@@ -2,47 +2,144 @@
 Metadata repository — MongoDB CRUD operations.
 
 All database interactions for metadata records go through this module.
-Uses Motor async driver for non-blocking I/O.
+Uses Motor async driver for non-blocking I/O. Pending-marks from the
+GET path and the worker's upserts are merged into bulk writes by
+MicroBatchers, and completed
+records are kept briefly in an in-process read cache.
 """
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
-from pymongo.errors import DuplicateKeyError, PyMongoError
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
 
+from app.core.config import settings
 from app.core.exceptions import DatabaseError
 from app.core.logging import get_logger
-from app.infrastructure.db.mongo import get_database
+from app.infrastructure.db.mongo import URL_INDEX_NAME, get_database
+from app.utils.batching import MicroBatcher
+from app.utils.cache import TTLCache
 
 logger = get_logger(__name__)
 
+# MongoDB error code for a unique-index violation
+_DUPLICATE_KEY_ERROR = 11000
+
+# Bound once so write paths skip the attribute lookups on every call.
+# Batched writes read the clock once per batch, not once per document.
+_UTC = timezone.utc
+_now = datetime.now
+
 
 class MetadataRepository:
-    """Async repository for metadata documents in MongoDB."""
+    """
+    Async repository for metadata documents in MongoDB.
+
+    Every write is acknowledged. The worker's upserts in particular
+    must land before the consumer stores the message offset: a
+    record left ``pending`` is never picked up again, since
+    mark_pending() skips pending URLs.
+
+    Completed records read or written through a repository are cached
+    for ``mongo_read_cache_ttl_seconds``. The cache is per instance;
+    use get_repository() so the API, consumer and worker share one.
+    Writes made by another process become visible once the entry expires.
+    """
 
     COLLECTION_NAME = "metadata"
 
-    def _get_collection(self):
-        """Return the metadata collection handle."""
-        return get_database()[self.COLLECTION_NAME]
+    def __init__(self) -> None:
+        self._database: AsyncIOMotorDatabase | None = None
+        self._collection: AsyncIOMotorCollection | None = None
+        self._pending_batcher: MicroBatcher[str, bool] = MicroBatcher(
+            self._write_pending_batch,
+            max_batch=settings.mongo_pending_batch_size,
+            linger=settings.mongo_pending_linger_ms / 1000,
+            name="mongo-pending-batcher",
+        )
+        self._upsert_batcher: MicroBatcher[tuple[str, dict[str, Any]], None]
+        self._upsert_batcher = MicroBatcher(
+            self._write_upsert_batch,
+            max_batch=settings.mongo_upsert_batch_size,
+            linger=settings.mongo_upsert_linger_ms / 1000,
+            name="mongo-upsert-batcher",
+        )
+        self._read_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            maxsize=settings.mongo_read_cache_size,
+            ttl=settings.mongo_read_cache_ttl_seconds,
+        )
+
+    async def close(self) -> None:
+        """Flush pending-marks and upserts still waiting in the batch window."""
+        await self._pending_batcher.close()
+        await self._upsert_batcher.close()
+
+    @property
+    def collection(self) -> AsyncIOMotorCollection:
+        """
+        Return the metadata collection handle.
+
+        The handle is built once and reused; it is only rebuilt if the
+        active database changes (e.g. after a reconnect).
+        """
+        database = get_database()
+        if self._collection is None or self._database is not database:
+            self._database = database
+            self._collection = database[self.COLLECTION_NAME]
+        return self._collection
 
     async def find_by_url(self, url: str) -> dict[str, Any] | None:
         """
         Look up a metadata record by its normalised URL.
 
+        Completed records are served from the read cache when present.
+
         Args:
             url: The normalised URL to search for.
 
         Returns:
             The document dict if found, otherwise None.
         """
+        cached = self._read_cache.get(url)
+        if cached is not None:
+            return cached
+
         try:
-            document = await self._get_collection().find_one({"url": url})
+            document = await self.collection.find_one({"url": url})
+            self._cache_if_completed(url, document)
             return document
         except PyMongoError as exc:
             logger.error("Database lookup failed for url=%s: %s", url, exc)
             raise DatabaseError("find_by_url", str(exc)) from exc
 
+    async def find_status(self, url: str) -> str | None:
+        """
+        Look up only the status of a metadata record.
+
+        Projects away every other field so a miss or pending lookup
+        does not transfer (or BSON-decode) the stored page source.
+
+        Args:
+            url: The normalised URL to search for.
+
+        Returns:
+            The record's status if found, otherwise None.
+        """
+        if self._read_cache.get(url) is not None:
+            return "completed"
+
+        try:
+            document = await self.collection.find_one(
+                {"url": url}, projection={"status": 1, "_id": 0}
+            )
+            return document.get("status") if document else None
+        except PyMongoError as exc:
+            logger.error("Database status lookup failed for url=%s: %s", url, exc)
+            raise DatabaseError("find_status", str(exc)) from exc
+
     async def upsert(self, url: str, data: dict[str, Any]) -> str:
         """
         Insert or update a metadata record for the given URL.
@@ -57,9 +154,129 @@ class MetadataRepository:
         Returns:
             The string representation of the document's _id.
         """
+        self._read_cache.pop(url)
         try:
-            now = datetime.now(timezone.utc)
-            result = await self._get_collection().update_one(
+            now = _now(_UTC)
+            update = {
+                "$set": {
+                    **data,
+                    "url": url,
+                    "status": "completed",
+                    "updated_at": now,
+                },
+                "$setOnInsert": {"created_at": now},
+            }
+
+            # findAndModify returns the _id in the same round-trip
+            result = await self.collection.find_one_and_update(
+                {"url": url},
+                update,
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+                projection={"_id": 1},
+            )
+            doc_id = result["_id"]
+            logger.info("Upserted metadata for url=%s (id=%s)", url, doc_id)
+            return str(doc_id)
+
+        except DuplicateKeyError:
+            # Race condition on concurrent upserts — safe to retry once
+            existing = await self.find_by_url(url)
+            if existing:
+                return str(existing["_id"])
+            raise DatabaseError("upsert", f"Duplicate key conflict for {url}")
+
+        except PyMongoError as exc:
+            logger.error("Database upsert failed for url=%s: %s", url, exc)
+            raise DatabaseError("upsert", str(exc)) from exc
+
+    async def upsert_batched(self, url: str, data: dict[str, Any]) -> None:
+        """
+        Insert or update a metadata record as part of a bulk write.
+
+        Same semantics as upsert(), but concurrent calls are merged into
+        a single unordered, acknowledged bulk write, so no document _id
+        is returned.
+
+        Args:
+            url: The normalised URL (used as the unique key).
+            data: The metadata payload to store.
+
+        Raises:
+            DatabaseError: If this URL's write failed.
+        """
+        self._read_cache.pop(url)
+        await self._upsert_batcher.submit((url, data))
+
+    async def _write_upsert_batch(
+        self, items: list[tuple[str, dict[str, Any]]]
+    ) -> list[DatabaseError | None]:
+        """
+        Upsert a batch of metadata records with one bulk write.
+
+        If a URL appears more than once, only its latest payload is
+        written. A duplicate-key error means a concurrent upsert created
+        the record first, which is treated as success.
+
+        Returns:
+            One entry per input item: None, or a DatabaseError if that
+            URL's write failed.
+        """
+        latest = dict(items)
+        unique_urls = list(latest)
+        now = _now(_UTC)
+        operations = [
+            UpdateOne(
+                {"url": url},
+                {
+                    "$set": {
+                        **latest[url],
+                        "url": url,
+                        "status": "completed",
+                        "updated_at": now,
+                    },
+                    "$setOnInsert": {"created_at": now},
+                },
+                upsert=True,
+            )
+            for url in unique_urls
+        ]
+
+        failures: dict[str, DatabaseError] = {}
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                if error.get("code") == _DUPLICATE_KEY_ERROR:
+                    continue
+                url = unique_urls[error["index"]]
+                logger.error("Database upsert failed for url=%s: %s", url, error.get("errmsg"))
+                failures[url] = DatabaseError("upsert", str(error.get("errmsg")))
+        except PyMongoError as exc:
+            logger.error("Database upsert failed for %d url(s): %s", len(unique_urls), exc)
+            raise DatabaseError("upsert", str(exc)) from exc
+
+        logger.debug("Upserted %d metadata record(s) in one bulk write", len(unique_urls))
+        return [failures.get(url) for url, _ in items]
+
+    async def upsert_returning(self, url: str, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Insert or update a metadata record and return the stored document.
+
+        Same semantics as upsert(), but uses findAndModify so the
+        post-update document comes back in the same round-trip.
+
+        Args:
+            url: The normalised URL (used as the unique key).
+            data: The metadata payload to store.
+
+        Returns:
+            The document as stored after the update.
+        """
+        self._read_cache.pop(url)
+        try:
+            now = _now(_UTC)
+            document = await self.collection.find_one_and_update(
                 {"url": url},
                 {
                     "$set": {
@@ -71,20 +288,17 @@ class MetadataRepository:
                     "$setOnInsert": {"created_at": now},
                 },
                 upsert=True,
+                return_document=ReturnDocument.AFTER,
             )
-            doc_id = result.upserted_id or (
-                await self._get_collection().find_one(
-                    {"url": url}, {"_id": 1}
-                )
-            )["_id"]
-            logger.info("Upserted metadata for url=%s (id=%s)", url, doc_id)
-            return str(doc_id)
+            logger.info("Upserted metadata for url=%s (id=%s)", url, document["_id"])
+            self._cache_if_completed(url, document)
+            return document
 
         except DuplicateKeyError:
-            # Race condition on concurrent upserts — safe to retry once
+            # Race condition on concurrent upserts — the other writer won
             existing = await self.find_by_url(url)
             if existing:
-                return str(existing["_id"])
+                return existing
             raise DatabaseError("upsert", f"Duplicate key conflict for {url}")
 
         except PyMongoError as exc:
@@ -95,9 +309,9 @@ class MetadataRepository:
         """
         Atomically mark a URL as pending collection.
 
-        Uses findAndModify semantics to prevent duplicate background
-        fetches — only succeeds if no document exists or the existing
-        document has failed status.
+        Only succeeds if no document exists or the existing document has
+        failed status, which prevents duplicate background fetches.
+        Concurrent calls are merged into a single unordered bulk write.
 
         Args:
             url: The normalised URL to mark as pending.
@@ -106,9 +320,27 @@ class MetadataRepository:
             True if the URL was newly marked pending (worker should fetch),
             False if a record already exists (skip).
         """
-        try:
-            now = datetime.now(timezone.utc)
-            result = await self._get_collection().update_one(
+        return await self._pending_batcher.submit(url)
+
+    async def _write_pending_batch(self, urls: list[str]) -> list[bool | DatabaseError]:
+        """
+        Mark a batch of URLs as pending with one bulk write.
+
+        Each URL gets a conditional upsert. An upsert that collides with
+        the unique url index means the record is already pending or
+        completed, so that URL reports False. Repeats of a URL within the
+        batch also report False, since the first occurrence claimed it.
+
+        Returns:
+            One entry per input URL: True/False, or a DatabaseError if
+            that URL's write failed for another reason.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        for url in unique_urls:
+            self._read_cache.pop(url)
+        now = _now(_UTC)
+        operations = [
+            UpdateOne(
                 {
                     "url": url,
                     "status": {"$nin": ["completed", "pending"]},
@@ -118,25 +350,44 @@ class MetadataRepository:
                     "$setOnInsert": {"created_at": now},
                 },
                 upsert=True,
+                # The $nin on status can make the planner weigh other
+                # plans; pin the url index so every call skips planning
+                hint=URL_INDEX_NAME,
             )
-            was_created = result.upserted_id is not None
-            was_modified = result.modified_count > 0
+            for url in unique_urls
+        ]
 
-            if was_created or was_modified:
+        write_errors: dict[int, dict[str, Any]] = {}
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            write_errors = {
+                error["index"]: error for error in exc.details.get("writeErrors", [])
+            }
+        except PyMongoError as exc:
+            logger.error("mark_pending failed for %d url(s): %s", len(unique_urls), exc)
+            raise DatabaseError("mark_pending", str(exc)) from exc
+
+        outcomes: dict[str, bool | DatabaseError] = {}
+        for index, url in enumerate(unique_urls):
+            error = write_errors.get(index)
+            if error is None:
                 logger.info("Marked url=%s as pending", url)
-                return True
-            else:
+                outcomes[url] = True
+            elif error.get("code") == _DUPLICATE_KEY_ERROR:
+                # Already pending or completed (or another writer won the race)
                 logger.debug("url=%s already pending or completed, skipping", url)
-                return False
+                outcomes[url] = False
+            else:
+                logger.error("mark_pending failed for url=%s: %s", url, error.get("errmsg"))
+                outcomes[url] = DatabaseError("mark_pending", str(error.get("errmsg")))
 
-        except DuplicateKeyError:
-            # Another request already created a record — safe to skip
-            logger.debug("url=%s race condition on mark_pending, skipping", url)
-            return False
-
-        except PyMongoError as exc:
-            logger.error("mark_pending failed for url=%s: %s", url, exc)
-            raise DatabaseError("mark_pending", str(exc)) from exc
+        results: list[bool | DatabaseError] = []
+        claimed: set[str] = set()
+        for url in urls:
+            results.append(False if url in claimed else outcomes[url])
+            claimed.add(url)
+        return results
 
     async def mark_failed(self, url: str, reason: str) -> None:
         """
@@ -146,17 +397,34 @@ class MetadataRepository:
             url: The normalised URL.
             reason: Human-readable failure reason.
         """
+        self._read_cache.pop(url)
         try:
-            await self._get_collection().update_one(
+            await self.collection.update_one(
                 {"url": url},
                 {
                     "$set": {
                         "status": "failed",
                         "error": reason,
-                        "updated_at": datetime.now(timezone.utc),
+                        "updated_at": _now(_UTC),
                     }
                 },
             )
             logger.warning("Marked url=%s as failed: %s", url, reason)
         except PyMongoError as exc:
             logger.error("mark_failed failed for url=%s: %s", url, exc)
+
+    def _cache_if_completed(self, url: str, document: dict[str, Any] | None) -> None:
+        """Keep a completed record in the read cache; others change too soon."""
+        if document is not None and document.get("status") == "completed":
+            self._read_cache.set(url, document)
+
+
+@lru_cache(maxsize=1)
+def get_repository() -> MetadataRepository:
+    """
+    Provide the process-wide MetadataRepository.
+
+    The API, consumer and worker all use this instance, so they share
+    one read cache and one set of write batchers.
+    """
+    return MetadataRepository()
@@ -2,15 +2,22 @@
 Kafka message consumer — subscribe to URL collection tasks.
 
 Runs as a long-lived asyncio task started during application lifespan.
-Uses confluent-kafka's Consumer with run_in_executor to avoid blocking
-the asyncio event loop.
+A dedicated OS thread owns confluent-kafka's blocking consume() loop and
+hands message batches to the event loop through a queue, so polling
+never ties up the event loop or any executor. The thread keeps calling
+consume() on a steady cadence and applies backpressure by pausing its
+partitions. Messages are processed concurrently, up to a configured limit. The offsets below which every
+message has been handled are stored with store_offsets(), and
+librdkafka auto-commits them periodically.
 """
 
 import asyncio
-import json
+import threading
+from collections import deque
 from typing import Optional
 
-from confluent_kafka import Consumer, KafkaError, KafkaException
+import orjson
+from confluent_kafka import Consumer, KafkaError, KafkaException, TopicPartition
 
 from app.core.config import settings
 from app.core.exceptions import PermanentCollectionError, TransientCollectionError
@@ -23,19 +30,161 @@ _consumer_task: Optional[asyncio.Task] = None
 _shutdown_event: Optional[asyncio.Event] = None
 
 
+class _Backlog:
+    """
+    Count messages consumed but not yet handled.
+
+    The consumer thread adds each batch it hands to the event loop, and
+    the loop subtracts messages as they finish.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def add(self, count: int) -> None:
+        """Record messages handed to the event loop."""
+        with self._lock:
+            self._size += count
+
+    def done(self, count: int = 1) -> None:
+        """Record messages that have been handled."""
+        with self._lock:
+            self._size -= count
+
+
+class _OffsetTracker:
+    """
+    Track in-flight offsets per partition and report what is safe to commit.
+
+    Messages from one partition may finish out of order when processed
+    concurrently. Only the highest offset below which every message has
+    finished is committed, so a crash never skips an unfinished message.
+
+    Thread-safe: the event loop records messages while rebalance
+    callbacks run on the consumer thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Offsets dispatched but not yet committable, in dispatch order
+        self._outstanding: dict[tuple[str, int], deque[int]] = {}
+        self._finished: dict[tuple[str, int], set[int]] = {}
+        # Next offset to commit per (topic, partition)
+        self._committable: dict[tuple[str, int], TopicPartition] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._committable)
+
+    def track(self, topic: str, partition: int, offset: int) -> None:
+        """Record a message that has been dispatched for processing."""
+        key = (topic, partition)
+        with self._lock:
+            self._outstanding.setdefault(key, deque()).append(offset)
+            self._finished.setdefault(key, set())
+
+    def finish(self, topic: str, partition: int, offset: int) -> None:
+        """Record a handled message, advancing the partition's commit offset."""
+        key = (topic, partition)
+        with self._lock:
+            outstanding = self._outstanding.get(key)
+            if outstanding is None:
+                # Partition was revoked while the message was in flight
+                return
+
+            finished = self._finished[key]
+            finished.add(offset)
+            next_offset = None
+            while outstanding and outstanding[0] in finished:
+                finished.discard(outstanding[0])
+                next_offset = outstanding.popleft() + 1
+            if next_offset is not None:
+                self._committable[key] = TopicPartition(topic, partition, next_offset)
+
+    def take_committable(self) -> list[TopicPartition]:
+        """Return and clear the offsets that are ready to commit."""
+        with self._lock:
+            offsets = list(self._committable.values())
+            self._committable.clear()
+        return offsets
+
+    def forget(self, partitions: list[TopicPartition]) -> None:
+        """Drop state for partitions this consumer no longer owns."""
+        with self._lock:
+            for tp in partitions:
+                key = (tp.topic, tp.partition)
+                self._outstanding.pop(key, None)
+                self._finished.pop(key, None)
+                self._committable.pop(key, None)
+
+
+def _consume_thread(
+    consumer: Consumer,
+    loop: asyncio.AbstractEventLoop,
+    handoff: asyncio.Queue,
+    backlog: _Backlog,
+    stop: threading.Event,
+) -> None:
+    """
+    Pull message batches on a dedicated thread and hand them to the loop.
+
+    If the thread fails, the exception is handed over in place of a
+    batch so the consumer task ends rather than waiting forever.
+
+    consume() is called on a steady cadence, never blocking on the event
+    loop, so the consumer stays within max.poll.interval.ms and rebalance
+    callbacks (which run inside consume()) are served promptly. Once
+    ``kafka_max_outstanding_messages`` are waiting or in flight, the
+    assigned partitions are paused; they are resumed when half of those
+    messages have finished.
+    """
+    batch_size = settings.kafka_consume_batch_size
+    high_water = settings.kafka_max_outstanding_messages
+    low_water = high_water // 2
+    paused = False
+    try:
+        while not stop.is_set():
+            outstanding = backlog.size
+            if outstanding >= high_water:
+                # Repeated each round: partitions from a rebalance start unpaused
+                consumer.pause(consumer.assignment())
+                paused = True
+            elif paused and outstanding <= low_water:
+                consumer.resume(consumer.assignment())
+                paused = False
+
+            messages = consumer.consume(batch_size, 1.0)
+            if not messages:
+                continue
+
+            backlog.add(len(messages))
+            loop.call_soon_threadsafe(handoff.put_nowait, messages)
+    except Exception as exc:
+        logger.error("Kafka consumer thread failed: %s", exc)
+        # Wake the event loop so the consumer task fails instead of idling
+        try:
+            loop.call_soon_threadsafe(handoff.put_nowait, exc)
+        except RuntimeError:
+            pass  # The loop is already closed
+
+
 async def _consume_loop() -> None:
     """
-    Main consumer loop — polls Kafka for messages and dispatches them.
+    Main consumer loop — receives Kafka messages and dispatches them.
 
-    Uses run_in_executor for the blocking consumer.poll() call so the
-    asyncio event loop stays responsive. The poll timeout (1.0s) ensures
-    we check the shutdown event regularly.
+    The blocking consumer.consume() runs on a dedicated thread, pulling
+    messages in batches, so the asyncio event loop stays responsive.
+    Up to ``kafka_consumer_concurrency`` messages are processed at once.
     """
     from app.worker.worker import process_url
     from app.infrastructure.messaging.producer import publish_with_retry, publish_to_dlq
-    from app.infrastructure.db.repository import MetadataRepository
+    from app.infrastructure.db.repository import get_repository
 
-    repo = MetadataRepository()
+    repo = get_repository()
 
     async def mark_failed_in_db(url: str, reason: str) -> None:
         """Mark a URL as permanently failed in MongoDB."""
@@ -48,129 +197,205 @@ async def _consume_loop() -> None:
         "bootstrap.servers": settings.kafka_bootstrap_servers,
         "group.id": settings.kafka_consumer_group,
         "auto.offset.reset": "earliest",
-        "enable.auto.commit": False,       # Manual commit for at-least-once
+        # At-least-once: we store offsets only once messages are handled,
+        # and librdkafka commits the stored offsets in the background
+        "enable.auto.commit": True,
+        "enable.auto.offset.store": False,
+        "auto.commit.interval.ms": settings.kafka_commit_interval_ms,
         "session.timeout.ms": 30000,
         "max.poll.interval.ms": 300000,
+        # Throughput over latency: let the broker fill larger fetches
+        "fetch.min.bytes": 100_000,        # Wait for ~100KB per fetch...
+        "fetch.wait.max.ms": 500,          # ...or at most 500ms
+        "queued.min.messages": 100_000,    # Prefetch deep local queue
+        "queued.max.messages.kbytes": 65536,
     })
 
-    consumer.subscribe([settings.kafka_topic])
+    # Committable offsets per partition, stored as messages finish
+    offsets = _OffsetTracker()
+    loop = asyncio.get_running_loop()
+    store_scheduled = False
+
+    in_flight: set[asyncio.Task] = set()
+    max_in_flight = settings.kafka_consumer_concurrency
+
+    backlog = _Backlog()
+
+    def mark_processed(topic: str, partition: int, offset: int) -> None:
+        """Record a handled message and schedule storing its offset."""
+        nonlocal store_scheduled
+        offsets.finish(topic, partition, offset)
+        backlog.done()
+        if not store_scheduled:
+            # One store per loop iteration covers every message finished in it
+            store_scheduled = True
+            loop.call_soon(store_processed)
+
+    def store_processed() -> None:
+        """Hand committable offsets to librdkafka's background auto-commit."""
+        nonlocal store_scheduled
+        store_scheduled = False
+        if offsets:
+            committable = offsets.take_committable()
+            try:
+                consumer.store_offsets(offsets=committable)
+            except KafkaException as exc:
+                logger.error("Kafka offset store failed: %s", exc)
+
+    def on_revoke(_consumer, partitions) -> None:
+        """Store outstanding offsets; librdkafka commits them before reassignment."""
+        store_processed()
+        # Messages still in flight for these partitions will be redelivered
+        offsets.forget(partitions)
+
+    async def handle_message(
+        url: str, retry_count: int, topic: str, partition: int, offset: int
+    ) -> None:
+        """Process one URL, routing failures to retry or the DLQ."""
+        try:
+            await process_url(url)
+            # Success — offset is stored once this loop iteration ends
+            mark_processed(topic, partition, offset)
+
+        except PermanentCollectionError as exc:
+            # Non-retryable (404, bad DNS, etc) → DLQ immediately
+            error_msg = str(exc)
+            logger.error(
+                "Permanent failure for url=%s: %s → sending to DLQ",
+                url, error_msg,
+            )
+            try:
+                await publish_to_dlq(url, retry_count, error_msg)
+                await mark_failed_in_db(url, error_msg)
+            except Exception as dlq_exc:
+                logger.error(
+                    "Failed to publish url=%s to DLQ: %s", url, dlq_exc,
+                )
+            mark_processed(topic, partition, offset)
+
+        except (TransientCollectionError, Exception) as exc:
+            # Retryable (5xx, timeout, etc) → retry up to max
+            error_msg = str(exc)
+            retry_count += 1
+
+            if retry_count >= settings.kafka_max_retries:
+                logger.error(
+                    "Transient failure exhausted retries for url=%s "
+                    "after %d attempts: %s → sending to DLQ",
+                    url, retry_count, error_msg,
+                )
+                try:
+                    await publish_to_dlq(url, retry_count, error_msg)
+                    await mark_failed_in_db(url, error_msg)
+                except Exception as dlq_exc:
+                    logger.error(
+                        "Failed to publish url=%s to DLQ: %s", url, dlq_exc,
+                    )
+            else:
+                logger.warning(
+                    "Transient failure for url=%s (attempt %d/%d): %s → retrying",
+                    url, retry_count, settings.kafka_max_retries, error_msg,
+                )
+                try:
+                    await publish_with_retry(url, retry_count)
+                except Exception as retry_exc:
+                    logger.error(
+                        "Failed to re-enqueue url=%s: %s", url, retry_exc,
+                    )
+
+            mark_processed(topic, partition, offset)
+
+    def dispatch(msg) -> None:
+        """Decode one polled message and start processing it in a task."""
+        # Each accessor is a call into the C extension; read them once
+        err = msg.error()
+        topic, partition, offset = msg.topic(), msg.partition(), msg.offset()
+
+        if err:
+            if err.code() == KafkaError._PARTITION_EOF:
+                logger.debug(
+                    "Reached end of partition %s [%d] at offset %d",
+                    topic,
+                    partition,
+                    offset,
+                )
+            else:
+                logger.error("Kafka consumer error: %s", err)
+            backlog.done()
+            return
+
+        offsets.track(topic, partition, offset)
+
+        # Deserialize the message
+        try:
+            # orjson parses the bytes directly; invalid UTF-8 is a decode error
+            data = orjson.loads(msg.value())
+            url = data.get("url")
+        except orjson.JSONDecodeError as exc:
+            logger.error(
+                "Failed to decode Kafka message at offset %d: %s",
+                offset,
+                exc,
+            )
+            mark_processed(topic, partition, offset)
+            return
+
+        if not url:
+            logger.warning(
+                "Received Kafka message without 'url' field at offset %d",
+                offset,
+            )
+            mark_processed(topic, partition, offset)
+            return
+
+        logger.info(
+            "Consumer received url=%s (topic=%s, partition=%d, offset=%d)",
+            url,
+            topic,
+            partition,
+            offset,
+        )
+
+        # Process the URL concurrently with other in-flight messages
+        task = asyncio.create_task(
+            handle_message(
+                url, data.get("retry_count", 0), topic, partition, offset
+            )
+        )
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    consumer.subscribe([settings.kafka_topic], on_revoke=on_revoke)
     logger.info(
         "Kafka consumer started (topic=%s, group=%s)",
         settings.kafka_topic,
         settings.kafka_consumer_group,
     )
 
-    loop = asyncio.get_event_loop()
+    handoff: asyncio.Queue = asyncio.Queue()
+    stop_thread = threading.Event()
+    consume_thread = threading.Thread(
+        target=_consume_thread,
+        args=(consumer, loop, handoff, backlog, stop_thread),
+        name="kafka-consumer",
+        daemon=True,
+    )
+    consume_thread.start()
 
     try:
         while not _shutdown_event.is_set():
             try:
-                # Run blocking poll() in a thread to avoid blocking event loop
-                msg = await loop.run_in_executor(None, consumer.poll, 1.0)
-
-                if msg is None:
-                    continue
-
-                if msg.error():
-                    if msg.error().code() == KafkaError._PARTITION_EOF:
-                        logger.debug(
-                            "Reached end of partition %s [%d] at offset %d",
-                            msg.topic(),
-                            msg.partition(),
-                            msg.offset(),
-                        )
-                        continue
-                    else:
-                        logger.error("Kafka consumer error: %s", msg.error())
-                        continue
-
-                # Deserialize the message
-                try:
-                    data = json.loads(msg.value().decode("utf-8"))
-                    url = data.get("url")
-                except (json.JSONDecodeError, UnicodeDecodeError) as exc:
-                    logger.error(
-                        "Failed to decode Kafka message at offset %d: %s",
-                        msg.offset(),
-                        exc,
-                    )
-                    continue
-
-                if not url:
-                    logger.warning(
-                        "Received Kafka message without 'url' field at offset %d",
-                        msg.offset(),
-                    )
-                    continue
-
-                logger.info(
-                    "Consumer received url=%s (topic=%s, partition=%d, offset=%d)",
-                    url,
-                    msg.topic(),
-                    msg.partition(),
-                    msg.offset(),
-                )
-
-                # Process the URL with error classification
-                retry_count = data.get("retry_count", 0)
-
-                try:
-                    await process_url(url)
-                    # Success — commit offset
-                    consumer.commit(message=msg)
-                    logger.debug(
-                        "Committed offset %d for partition %d",
-                        msg.offset(),
-                        msg.partition(),
-                    )
-
-                except PermanentCollectionError as exc:
-                    # Non-retryable (404, bad DNS, etc) → DLQ immediately
-                    error_msg = str(exc)
-                    logger.error(
-                        "Permanent failure for url=%s: %s → sending to DLQ",
-                        url, error_msg,
-                    )
-                    try:
-                        await publish_to_dlq(url, retry_count, error_msg)
-                        await mark_failed_in_db(url, error_msg)
-                    except Exception as dlq_exc:
-                        logger.error(
-                            "Failed to publish url=%s to DLQ: %s", url, dlq_exc,
-                        )
-                    consumer.commit(message=msg)
-
-                except (TransientCollectionError, Exception) as exc:
-                    # Retryable (5xx, timeout, etc) → retry up to max
-                    error_msg = str(exc)
-                    retry_count += 1
-
-                    if retry_count >= settings.kafka_max_retries:
-                        logger.error(
-                            "Transient failure exhausted retries for url=%s "
-                            "after %d attempts: %s → sending to DLQ",
-                            url, retry_count, error_msg,
-                        )
-                        try:
-                            await publish_to_dlq(url, retry_count, error_msg)
-                            await mark_failed_in_db(url, error_msg)
-                        except Exception as dlq_exc:
-                            logger.error(
-                                "Failed to publish url=%s to DLQ: %s", url, dlq_exc,
-                            )
-                    else:
-                        logger.warning(
-                            "Transient failure for url=%s (attempt %d/%d): %s → retrying",
-                            url, retry_count, settings.kafka_max_retries, error_msg,
+                messages = await handoff.get()
+                if isinstance(messages, Exception):
+                    raise RuntimeError("Kafka consumer thread stopped") from messages
+
+                for msg in messages:
+                    if len(in_flight) >= max_in_flight:
+                        # Wait for a free slot before starting more work
+                        await asyncio.wait(
+                            in_flight, return_when=asyncio.FIRST_COMPLETED
                         )
-                        try:
-                            await publish_with_retry(url, retry_count)
-                        except Exception as retry_exc:
-                            logger.error(
-                                "Failed to re-enqueue url=%s: %s", url, retry_exc,
-                            )
-
-                    consumer.commit(message=msg)
+                    dispatch(msg)
 
             except asyncio.CancelledError:
                 logger.info("Consumer loop cancelled")
@@ -179,6 +404,16 @@ async def _consume_loop() -> None:
     except asyncio.CancelledError:
         pass
     finally:
+        # Unfinished messages are not committed and will be redelivered
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        store_processed()
+        # The thread exits within one consume() timeout; close() must not
+        # race with it, and commits the stored offsets one last time
+        stop_thread.set()
+        await asyncio.to_thread(consume_thread.join)
         consumer.close()
         logger.info("Kafka consumer closed")
 
@@ -195,9 +430,16 @@ async def start_consumer() -> None:
     _consumer_task = asyncio.create_task(
         _consume_loop(), name="kafka-consumer"
     )
+    _consumer_task.add_done_callback(_log_consumer_exit)
     logger.info("Kafka consumer task created")
 
 
+def _log_consumer_exit(task: asyncio.Task) -> None:
+    """Surface a consumer task that ended with an error."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Kafka consumer stopped unexpectedly: %s", task.exception())
+
+
 async def stop_consumer() -> None:
     """Gracefully stop the Kafka consumer."""
     global _consumer_task, _shutdown_event
@@ -2,23 +2,60 @@
 Kafka message producer — publish URLs for background collection.
 
 Uses confluent-kafka's Producer with async-friendly delivery callbacks.
-The Producer is initialized once during application startup and reused.
+The Producer is initialized once during application startup and reused;
+a background thread polls it so delivery callbacks are served without
+a poll() call on every publish.
+
+URLs scheduled from the API are coalesced by a MicroBatcher: each batch
+window produces exactly one message per distinct URL.
 """
 
-import json
+import re
+import threading
 from typing import Optional
 
+import orjson
 from confluent_kafka import Producer, KafkaError
 from confluent_kafka.admin import AdminClient, NewTopic
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.utils.batching import MicroBatcher
 
 logger = get_logger(__name__)
 
 # Module-level producer reference
 _producer: Optional[Producer] = None
 
+# Background thread serving delivery callbacks, and its stop signal
+_poll_thread: Optional[threading.Thread] = None
+_poll_stop = threading.Event()
+
+# Characters that JSON requires to be escaped inside a string, plus lone
+# surrogates, which cannot be encoded at all (orjson rejects them)
+_JSON_UNSAFE_RE = re.compile(r'["\\\x00-\x1f\ud800-\udfff]')
+
+
+def _encode_task(url: str) -> bytes:
+    """
+    Encode a {"url": ...} task message.
+
+    URLs rarely need JSON escaping, so the message is built from a byte
+    template around the URL's UTF-8 encoding; orjson is only used for
+    URLs that do. The URL is sent as given, and both paths produce the
+    same bytes as orjson.dumps({"url": url}).
+    """
+    if _JSON_UNSAFE_RE.search(url):
+        return orjson.dumps({"url": url})
+    return b'{"url":"%b"}' % url.encode()
+
+
+def _encode_retry(url: str, retry_count: int) -> bytes:
+    """Encode a {"url": ..., "retry_count": ...} message, as _encode_task does."""
+    if _JSON_UNSAFE_RE.search(url):
+        return orjson.dumps({"url": url, "retry_count": retry_count})
+    return b'{"url":"%b","retry_count":%d}' % (url.encode(), retry_count)
+
 
 def ensure_topics() -> None:
     """
@@ -56,9 +93,10 @@ def init_producer() -> None:
     """
     Initialize the Kafka producer.
 
-    Called once during application startup (lifespan).
+    Called once during application startup (lifespan). Also starts the
+    background thread that polls for delivery callbacks.
     """
-    global _producer
+    global _producer, _poll_thread
     _producer = Producer({
         "bootstrap.servers": settings.kafka_bootstrap_servers,
         "client.id": "metadata-api-producer",
@@ -68,20 +106,40 @@ def init_producer() -> None:
         "linger.ms": 10,                  # Micro-batch for throughput
         "compression.type": "snappy",     # Compress messages
     })
+    _poll_stop.clear()
+    _poll_thread = threading.Thread(
+        target=_poll_loop,
+        args=(_producer,),
+        name="kafka-producer-poll",
+        daemon=True,
+    )
+    _poll_thread.start()
     logger.info(
         "Kafka producer initialized (bootstrap=%s)",
         settings.kafka_bootstrap_servers,
     )
 
 
+def _poll_loop(producer: Producer) -> None:
+    """Serve delivery callbacks until close_producer() signals a stop."""
+    while not _poll_stop.is_set():
+        producer.poll(0.1)
+
+
 def close_producer() -> None:
     """
     Flush and close the Kafka producer.
 
-    Called during application shutdown. Flushes any buffered
-    messages with a timeout to avoid hanging on shutdown.
+    Called during application shutdown. Stops the poll thread, then
+    flushes any buffered messages with a timeout to avoid hanging on
+    shutdown.
     """
-    global _producer
+    global _producer, _poll_thread
+    if _poll_thread is not None:
+        _poll_stop.set()
+        _poll_thread.join()
+        _poll_thread = None
+
     if _producer is not None:
         remaining = _producer.flush(timeout=10)
         if remaining > 0:
@@ -115,13 +173,58 @@ def _delivery_callback(err, msg) -> None:
         )
 
 
+async def _produce_enqueued(urls: list[str]) -> list[Optional[Exception]]:
+    """
+    Produce one task message per distinct URL in a coalesced batch.
+
+    Returns one entry per input URL: None on success, or the exception
+    raised while producing that URL.
+    """
+    results: dict[str, Optional[Exception]] = {}
+
+    for url in urls:
+        if url in results:
+            continue
+        try:
+            _producer.produce(
+                topic=settings.kafka_topic,
+                value=_encode_task(url),
+                callback=_delivery_callback,
+            )
+            results[url] = None
+        except BufferError as exc:
+            logger.warning(
+                "Kafka producer buffer full. Dropping url=%s — "
+                "consider scaling or increasing buffer size.",
+                url,
+            )
+            results[url] = exc
+
+    logger.info(
+        "Enqueued %d url(s) to Kafka topic=%s (%d coalesced)",
+        len(results),
+        settings.kafka_topic,
+        len(urls) - len(results),
+    )
+    return [results[url] for url in urls]
+
+
+_enqueue_batcher: MicroBatcher[str, None] = MicroBatcher(
+    _produce_enqueued,
+    max_batch=settings.kafka_enqueue_batch_size,
+    linger=settings.kafka_enqueue_linger_ms / 1000,
+    name="kafka-enqueue-batcher",
+)
+
+
 async def enqueue(url: str) -> None:
     """
     Publish a URL to the Kafka topic for background collection.
 
-    The confluent-kafka Producer.produce() is non-blocking — it
-    buffers the message internally and sends it asynchronously.
-    poll(0) triggers delivery callbacks without blocking.
+    The URL joins the current batch window; concurrent calls for the
+    same URL within one window share a single Kafka message. The
+    confluent-kafka Producer.produce() is non-blocking — it buffers the
+    message internally and sends it asynchronously.
 
     Args:
         url: The normalised URL to collect metadata for.
@@ -136,25 +239,16 @@ async def enqueue(url: str) -> None:
             "Ensure init_producer() was called during startup."
         )
 
-    message = json.dumps({"url": url})
+    await _enqueue_batcher.submit(url)
 
-    try:
-        _producer.produce(
-            topic=settings.kafka_topic,
-            value=message.encode("utf-8"),
-            callback=_delivery_callback,
-        )
-        # Trigger any pending delivery callbacks (non-blocking)
-        _producer.poll(0)
-        logger.info("Enqueued url=%s to Kafka topic=%s", url, settings.kafka_topic)
-
-    except BufferError:
-        logger.warning(
-            "Kafka producer buffer full. Dropping url=%s — "
-            "consider scaling or increasing buffer size.",
-            url,
-        )
-        raise
+
+async def stop_enqueue_batcher() -> None:
+    """
+    Produce any URLs still waiting in the enqueue batch window.
+
+    Called during application shutdown, before close_producer().
+    """
+    await _enqueue_batcher.close()
 
 
 async def publish_with_retry(url: str, retry_count: int) -> None:
@@ -170,14 +264,13 @@ async def publish_with_retry(url: str, retry_count: int) -> None:
     if _producer is None:
         raise RuntimeError("Kafka producer is not initialized.")
 
-    message = json.dumps({"url": url, "retry_count": retry_count})
+    message = _encode_retry(url, retry_count)
 
     _producer.produce(
         topic=settings.kafka_topic,
-        value=message.encode("utf-8"),
+        value=message,
         callback=_delivery_callback,
     )
-    _producer.poll(0)
     logger.info(
         "Re-enqueued url=%s to topic=%s (retry_count=%d)",
         url, settings.kafka_topic, retry_count,
@@ -196,7 +289,7 @@ async def publish_to_dlq(url: str, retry_count: int, error: str) -> None:
     if _producer is None:
         raise RuntimeError("Kafka producer is not initialized.")
 
-    message = json.dumps({
+    message = orjson.dumps({
         "url": url,
         "retry_count": retry_count,
         "error": error,
@@ -204,10 +297,9 @@ async def publish_to_dlq(url: str, retry_count: int, error: str) -> None:
 
     _producer.produce(
         topic=settings.kafka_dlq_topic,
-        value=message.encode("utf-8"),
+        value=message,
         callback=_delivery_callback,
     )
-    _producer.poll(0)
     logger.warning(
         "Sent url=%s to DLQ topic=%s after %d retries (error=%s)",
         url, settings.kafka_dlq_topic, retry_count, error,
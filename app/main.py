@@ -9,17 +9,26 @@ Creates and configures the FastAPI application with:
   - Health check endpoint
 """
 
+from typing import AsyncContextManager, Callable, Optional
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import router as metadata_router
 from app.core.lifespan import lifespan
 from app.core.exceptions import MetadataServiceError
 
 
-def create_app() -> FastAPI:
-    """Application factory — creates and configures the FastAPI instance."""
+def create_app(
+    lifespan: Optional[Callable[[FastAPI], AsyncContextManager[None]]] = lifespan,
+) -> FastAPI:
+    """
+    Application factory — creates and configures the FastAPI instance.
+
+    Pass ``lifespan=None`` to build an app that starts no MongoDB,
+    Kafka or HTTP client connections, as the test suite does.
+    """
 
     application = FastAPI(
         title="Metadata Collection Service",
@@ -31,6 +40,7 @@ def create_app() -> FastAPI:
         ),
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
     )
@@ -64,7 +74,7 @@ def create_app() -> FastAPI:
         request: Request, exc: MetadataServiceError
     ):
         """Handle all custom MetadataService exceptions."""
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": exc.message},
         )
@@ -72,7 +82,7 @@ def create_app() -> FastAPI:
     @application.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         """Catch-all handler to prevent stack traces from leaking to clients."""
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": "An internal server error occurred."},
         )
@@ -8,9 +8,50 @@ preventing duplicate entries for variants like:
   - https://example.com/path#section  →  https://example.com/path
 """
 
+import re
+import sys
+from functools import lru_cache
 from urllib.parse import urlparse, urlunparse, urlencode, parse_qs
 
+# Queries made only of these characters survive parse_qs/urlencode
+# unchanged, so they can be sorted without decoding and re-encoding
+_PLAIN_QUERY_RE = re.compile(r"[A-Za-z0-9_.~&=-]*")
 
+
+def _sort_query(query: str) -> str:
+    """
+    Sort query parameters by key, keeping the first value of each key.
+
+    Plain queries are split and re-joined directly; anything with
+    escapes, '+' or other reserved characters goes through
+    parse_qs/urlencode so the result is identical either way.
+    """
+    if not query:
+        return ""
+
+    if _PLAIN_QUERY_RE.fullmatch(query):
+        params: dict[str, str] = {}
+        for pair in query.split("&"):
+            if not pair:
+                continue
+            key, _, value = pair.partition("=")
+            if "=" in value:
+                # urlencode would escape the second '='
+                break
+            params.setdefault(key, value)
+        else:
+            return "&".join(f"{key}={value}" for key, value in sorted(params.items()))
+
+    query_params = parse_qs(query, keep_blank_values=True)
+    return urlencode(
+        sorted(
+            [(k, v[0]) for k, v in query_params.items()],
+            key=lambda x: x[0],
+        )
+    ) if query_params else ""
+
+
+@lru_cache(maxsize=65536)
 def normalize_url(url: str) -> str:
     """
     Normalise a URL to its canonical form.
@@ -23,6 +64,10 @@ def normalize_url(url: str) -> str:
       5. Remove trailing slash on path (except root)
       6. Ensure scheme is present (default to https)
 
+    Results are memoised in a bounded LRU cache, since the same hot
+    URLs are requested repeatedly, and interned so every copy of a
+    normalised URL is the same string object.
+
     Args:
         url: The raw URL string.
 
@@ -30,15 +75,14 @@ def normalize_url(url: str) -> str:
         The normalised URL string.
     """
     # Ensure scheme is present (case-insensitive check)
-    if not url.lower().startswith(("http://", "https://")):
+    if not url[:8].lower().startswith(("http://", "https://")):
         url = f"https://{url}"
 
     parsed = urlparse(url)
 
-    # Lowercase scheme and hostname
-    scheme = parsed.scheme.lower()
+    # urlparse already lowercases the scheme and hostname
+    scheme = parsed.scheme
     hostname = parsed.hostname or ""
-    hostname = hostname.lower()
 
     # Remove default ports
     port = parsed.port
@@ -58,15 +102,9 @@ def normalize_url(url: str) -> str:
         path = "/"
 
     # Sort query parameters for consistent ordering
-    query_params = parse_qs(parsed.query, keep_blank_values=True)
-    sorted_query = urlencode(
-        sorted(
-            [(k, v[0]) for k, v in query_params.items()],
-            key=lambda x: x[0],
-        )
-    ) if query_params else ""
+    sorted_query = _sort_query(parsed.query)
 
     # Drop fragment entirely
     normalised = urlunparse((scheme, netloc, path, "", sorted_query, ""))
 
-    return normalised
+    return sys.intern(normalised)
@@ -10,6 +10,8 @@ Raises classified exceptions so the consumer can decide:
   - Other exceptions → treated as transient
 """
 
+import logging
+
 from app.core.exceptions import (
     CollectionError,
     PermanentCollectionError,
@@ -17,13 +19,10 @@ from app.core.exceptions import (
 )
 from app.core.logging import get_logger
 from app.infrastructure.crawler.http_client import fetch_url
-from app.infrastructure.db.repository import MetadataRepository
+from app.infrastructure.db.repository import get_repository
 
 logger = get_logger(__name__)
 
-# Shared repository instance for the worker
-_repo = MetadataRepository()
-
 
 async def process_url(url: str) -> None:
     """
@@ -40,7 +39,7 @@ async def process_url(url: str) -> None:
         PermanentCollectionError: URL will never succeed (4xx, bad DNS).
         TransientCollectionError: URL might succeed on retry (5xx, timeout).
     """
-    logger.info("Worker: processing url=%s", url)
+    logger.debug("Worker: processing url=%s", url)
 
     # Fetch URL metadata — raises classified exceptions
     collected = await fetch_url(url)
@@ -53,12 +52,13 @@ async def process_url(url: str) -> None:
         "status_code": collected.status_code,
     }
 
-    # Store in database
-    doc_id = await _repo.upsert(url, data)
-    logger.info(
-        "Worker: successfully collected and stored metadata for "
-        "url=%s (id=%s, size=%d bytes)",
-        url,
-        doc_id,
-        len(collected.page_source),
-    )
+    # Store in database, merged into a bulk write with concurrent URLs.
+    # The write is acknowledged before the consumer stores this offset.
+    await get_repository().upsert_batched(url, data)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Worker: successfully collected and stored metadata for "
+            "url=%s (size=%d bytes)",
+            url,
+            len(collected.page_source),
+        )
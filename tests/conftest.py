@@ -3,98 +3,180 @@ Shared test fixtures for the metadata service test suite.
 
 Provides:
   - Async test client for FastAPI integration tests
-  - Mock MongoDB fixtures
+  - A shared fake MongoDB collection and mock repository
   - Mock HTTP response fixtures
 """
 
-import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-from typing import AsyncIterator
+from datetime import datetime, timezone
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import create_autospec
+from typing import AsyncIterator, Optional
 
 import pytest
 import pytest_asyncio
+from fastapi import FastAPI
 from httpx import AsyncClient, ASGITransport
 
-from app.main import app
+from app.api.dependencies import _build_metadata_service
+from app.infrastructure.crawler.http_client import CollectedData
+from app.infrastructure.db.repository import MetadataRepository, get_repository
+from app.main import create_app
+
+
+# Built once: autospeccing walks the whole MetadataRepository API
+_MOCK_REPOSITORY = create_autospec(MetadataRepository, instance=True)
+
+# Shared, read-only sample documents; MappingProxyType stops a test from
+# mutating state the next test relies on
+_SAMPLE_METADATA_DOC = MappingProxyType({
+    "_id": "64f1a2b3c4d5e6f7a8b9c0d1",
+    "url": "https://example.com/",
+    "headers": MappingProxyType({
+        "content-type": "text/html; charset=UTF-8",
+        "server": "ECS (dcb/7EEB)",
+    }),
+    "cookies": MappingProxyType({}),
+    "page_source": "<html><body><h1>Example</h1></body></html>",
+    "status_code": 200,
+    "status": "completed",
+    "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+})
+
+_SAMPLE_COLLECTED = CollectedData(
+    headers={"content-type": "text/html"},
+    cookies={},
+    page_source="<html>Test</html>",
+    status_code=200,
+)
+
+_SAMPLE_PENDING_DOC = MappingProxyType({
+    "_id": "64f1a2b3c4d5e6f7a8b9c0d2",
+    "url": "https://pending.example.com/",
+    "status": "pending",
+    "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+})
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create a single event loop for the entire test session."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def test_app() -> FastAPI:
+    """
+    Provide the FastAPI app under test, built once per session.
+
+    It has no lifespan, so MongoDB, Kafka and the HTTP client are never
+    started; fakes are injected through test_app.dependency_overrides.
+    """
+    return create_app(lifespan=None)
 
 
-@pytest_asyncio.fixture
-async def async_client() -> AsyncIterator[AsyncClient]:
+@pytest_asyncio.fixture(scope="session")
+async def async_client(test_app: FastAPI) -> AsyncIterator[AsyncClient]:
     """
     Provide an async HTTP test client for integration tests.
 
-    Patches MongoDB connection and consumer to avoid requiring
-    a live database during testing.
+    One client is shared by the whole session. The app has no
+    lifespan, so no live database or broker is needed. Tests may
+    register fakes in test_app.dependency_overrides; reset_app_state
+    clears them after each test.
+    """
+    transport = ASGITransport(app=test_app)
+    async with AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        yield client
+
+
+@pytest_asyncio.fixture
+async def reset_app_state(test_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Clear dependency overrides and the shared repository after a test.
+
+    Used by the API tests, which reach the shared repository through
+    the app; unit tests build their own and do not need it.
+    """
+    yield
+    test_app.dependency_overrides.clear()
+    if get_repository.cache_info().currsize:
+        await get_repository().close()
+    # Start every test with a fresh repository and an empty read cache
+    _build_metadata_service.cache_clear()
+    get_repository.cache_clear()
+
+
+class FakeCollection:
+    """
+    Minimal async stand-in for the Motor metadata collection.
+
+    Lookups return ``doc`` (None by default, i.e. a miss) and writes
+    succeed; each bulk write's operations are recorded in ``bulk_writes``.
     """
-    with patch("app.core.lifespan.connect_to_mongo", new_callable=AsyncMock), \
-         patch("app.core.lifespan.close_mongo", new_callable=AsyncMock), \
-         patch("app.core.lifespan.ensure_indexes", new_callable=AsyncMock), \
-         patch("app.core.lifespan.ensure_topics"), \
-         patch("app.core.lifespan.init_producer"), \
-         patch("app.core.lifespan.close_producer"), \
-         patch("app.core.lifespan.start_consumer", new_callable=AsyncMock), \
-         patch("app.core.lifespan.stop_consumer", new_callable=AsyncMock):
-
-        transport = ASGITransport(app=app)
-        async with AsyncClient(
-            transport=transport, base_url="http://testserver"
-        ) as client:
-            yield client
+
+    def __init__(self) -> None:
+        self.doc: Optional[dict] = None
+        self.bulk_writes: list[list] = []
+
+    async def find_one(self, *args, **kwargs) -> Optional[dict]:
+        return self.doc
+
+    async def find_one_and_update(self, *args, **kwargs) -> Optional[dict]:
+        return self.doc
+
+    async def update_one(self, *args, **kwargs) -> SimpleNamespace:
+        return SimpleNamespace(upserted_id=None, modified_count=0)
+
+    async def bulk_write(self, requests, **kwargs) -> None:
+        self.bulk_writes.append(list(requests))
+
+
+@pytest.fixture
+def fake_collection(
+    monkeypatch: pytest.MonkeyPatch, reset_app_state: None
+) -> FakeCollection:
+    """
+    Point the repository at a fresh fake metadata collection for this test.
+
+    Requests reset_app_state so the shared repository is flushed and
+    closed before the patch is undone.
+    """
+    collection = FakeCollection()
+    database = {MetadataRepository.COLLECTION_NAME: collection}
+    monkeypatch.setattr(
+        "app.infrastructure.db.repository.get_database", lambda: database
+    )
+    return collection
 
 
 @pytest.fixture
 def mock_repository():
     """
-    Provide a mock MetadataRepository.
+    Provide the shared autospecced MetadataRepository, reset for this test.
 
     Pre-configured with async methods for use in unit tests.
     """
-    repo = MagicMock()
-    repo.find_by_url = AsyncMock(return_value=None)
-    repo.upsert = AsyncMock(return_value="mock_id_123")
-    repo.mark_pending = AsyncMock(return_value=True)
-    repo.mark_failed = AsyncMock()
+    repo = _MOCK_REPOSITORY
+    repo.reset_mock(return_value=True, side_effect=True)
+    repo.find_by_url.return_value = None
+    repo.find_status.return_value = None
+    repo.upsert.return_value = "mock_id_123"
+    repo.upsert_returning.return_value = None
+    repo.mark_pending.return_value = True
     return repo
 
 
 @pytest.fixture
 def sample_metadata_doc():
     """Provide a sample MongoDB metadata document for testing."""
-    from datetime import datetime, timezone
-
-    return {
-        "_id": "64f1a2b3c4d5e6f7a8b9c0d1",
-        "url": "https://example.com/",
-        "headers": {
-            "content-type": "text/html; charset=UTF-8",
-            "server": "ECS (dcb/7EEB)",
-        },
-        "cookies": {},
-        "page_source": "<html><body><h1>Example</h1></body></html>",
-        "status_code": 200,
-        "status": "completed",
-        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
-        "updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
-    }
+    return _SAMPLE_METADATA_DOC
 
 
 @pytest.fixture
 def sample_pending_doc():
     """Provide a sample pending metadata document."""
-    from datetime import datetime, timezone
-
-    return {
-        "_id": "64f1a2b3c4d5e6f7a8b9c0d2",
-        "url": "https://pending.example.com/",
-        "status": "pending",
-        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
-        "updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
-    }
+    return _SAMPLE_PENDING_DOC
+
+
+@pytest.fixture
+def sample_collected():
+    """Provide a sample successful fetch result."""
+    return _SAMPLE_COLLECTED
@@ -0,0 +1,11 @@
+"""
+Shared assertion helpers for the API integration tests.
+"""
+
+from typing import Any
+
+
+def _msg_contains(data: dict[str, Any], *needles: str) -> bool:
+    """Return True if the response's message mentions any of ``needles``."""
+    message = data["message"].lower()
+    return any(needle in message for needle in needles)
@@ -6,27 +6,30 @@ with mocked MongoDB and HTTP clients, validating the full
 request → response cycle.
 """
 
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock
 
 from httpx import AsyncClient
 
-from app.infrastructure.crawler.http_client import CollectedData
+from app.api.dependencies import get_metadata_repository, get_metadata_service
+from app.domain import metadata_service
+from app.domain.metadata_service import MetadataService
+from app.infrastructure.db.repository import get_repository
+from tests.integration._helpers import _msg_contains
+
+pytestmark = pytest.mark.usefixtures("reset_app_state")
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestPostMetadata:
     """Integration tests for POST /api/v1/metadata."""
 
-    async def test_post_valid_url_returns_201(self, async_client: AsyncClient):
+    async def test_post_valid_url_returns_201(
+        self, async_client: AsyncClient, test_app, fake_collection, sample_collected
+    ):
         """Should return 201 with full metadata on successful collection."""
-        mock_collected = CollectedData(
-            headers={"content-type": "text/html"},
-            cookies={"session": "abc"},
-            page_source="<html>Test</html>",
-            status_code=200,
-        )
-
         mock_doc = {
             "_id": "test_id_123",
             "url": "https://example.com/",
@@ -39,26 +42,16 @@ class TestPostMetadata:
             "updated_at": "2024-01-01T00:00:00Z",
         }
 
-        with patch(
-            "app.domain.metadata_service.fetch_url",
-            new_callable=AsyncMock,
-            return_value=mock_collected,
-        ), patch(
-            "app.infrastructure.db.repository.get_database"
-        ) as mock_db:
-            mock_collection = MagicMock()
-            mock_collection.update_one = AsyncMock(
-                return_value=MagicMock(upserted_id="test_id_123")
-            )
-            mock_collection.find_one = AsyncMock(return_value=mock_doc)
-            mock_db.return_value.__getitem__ = MagicMock(
-                return_value=mock_collection
-            )
-
-            response = await async_client.post(
-                "/api/v1/metadata",
-                json={"url": "https://example.com"},
-            )
+        fake_collection.doc = mock_doc
+        test_app.dependency_overrides[get_metadata_service] = lambda: MetadataService(
+            repository=get_repository(),
+            fetcher=AsyncMock(return_value=sample_collected),
+        )
+
+        response = await async_client.post(
+            "/api/v1/metadata",
+            json={"url": "https://example.com"},
+        )
 
         assert response.status_code == 201
         data = response.json()
@@ -86,69 +79,52 @@ class TestPostMetadata:
         assert response.status_code == 422
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestGetMetadata:
     """Integration tests for GET /api/v1/metadata."""
 
-    async def test_get_existing_url_returns_200(self, async_client: AsyncClient):
+    async def test_get_existing_url_returns_200(
+        self,
+        async_client: AsyncClient,
+        test_app,
+        mock_repository,
+        sample_metadata_doc,
+    ):
         """Should return 200 with full metadata when record exists."""
-        mock_doc = {
-            "_id": "test_id_123",
-            "url": "https://example.com/",
-            "headers": {"content-type": "text/html"},
-            "cookies": {},
-            "page_source": "<html>Cached</html>",
-            "status_code": 200,
-            "status": "completed",
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z",
-        }
-
-        with patch(
-            "app.infrastructure.db.repository.get_database"
-        ) as mock_db:
-            mock_collection = MagicMock()
-            mock_collection.find_one = AsyncMock(return_value=mock_doc)
-            mock_db.return_value.__getitem__ = MagicMock(
-                return_value=mock_collection
-            )
+        mock_repository.find_status.return_value = "completed"
+        mock_repository.find_by_url.return_value = sample_metadata_doc
+        test_app.dependency_overrides[get_metadata_repository] = lambda: mock_repository
 
-            response = await async_client.get(
-                "/api/v1/metadata",
-                params={"url": "https://example.com"},
-            )
+        response = await async_client.get(
+            "/api/v1/metadata",
+            params={"url": "https://example.com"},
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert data["url"] == "https://example.com/"
         assert data["status"] == "completed"
+        mock_repository.find_by_url.assert_called_once_with("https://example.com/")
 
-    async def test_get_missing_url_returns_202(self, async_client: AsyncClient):
+    async def test_get_missing_url_returns_202(
+        self, async_client: AsyncClient, monkeypatch, fake_collection
+    ):
         """Should return 202 Accepted and schedule background collection."""
-        with patch(
-            "app.infrastructure.db.repository.get_database"
-        ) as mock_db, patch(
-            "app.domain.metadata_service.enqueue",
-            new_callable=AsyncMock,
-        ) as mock_enqueue:
-            mock_collection = MagicMock()
-            mock_collection.find_one = AsyncMock(return_value=None)
-            mock_collection.update_one = AsyncMock(
-                return_value=MagicMock(upserted_id="new_id", modified_count=0)
-            )
-            mock_db.return_value.__getitem__ = MagicMock(
-                return_value=mock_collection
-            )
-
-            response = await async_client.get(
-                "/api/v1/metadata",
-                params={"url": "https://unknown-site.com"},
-            )
+        mock_enqueue = AsyncMock()
+        monkeypatch.setattr(metadata_service, "enqueue", mock_enqueue)
+
+        response = await async_client.get(
+            "/api/v1/metadata",
+            params={"url": "https://unknown-site.com"},
+        )
+        await asyncio.gather(*metadata_service._background_tasks)
 
         assert response.status_code == 202
         data = response.json()
         assert data["status"] == "pending"
-        assert "scheduled" in data["message"].lower() or "retry" in data["message"].lower()
+        assert _msg_contains(data, "scheduled", "retry")
+        mock_enqueue.assert_called_once_with("https://unknown-site.com/")
+        assert len(fake_collection.bulk_writes) == 1
 
     async def test_get_without_url_param_returns_422(
         self, async_client: AsyncClient
@@ -159,7 +135,7 @@ class TestGetMetadata:
         assert response.status_code == 422
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestHealthCheck:
     """Integration tests for the health check endpoint."""
 
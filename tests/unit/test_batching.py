@@ -0,0 +1,127 @@
+"""
+Unit tests for the MicroBatcher utility.
+
+Tests cover:
+  - Coalescing concurrent submissions into one flush
+  - Per-item results and exceptions
+  - Flush failures propagating to callers
+  - Draining queued items on close
+  - Refusing submissions after close
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.utils.batching import MicroBatcher
+
+
+@pytest_asyncio.fixture
+async def make_batcher():
+    """Build MicroBatchers for a test and close them all on teardown."""
+    batchers = []
+
+    def _make(flush, **kwargs):
+        batcher = MicroBatcher(flush, **kwargs)
+        batchers.append(batcher)
+        return batcher
+
+    yield _make
+    for batcher in batchers:
+        await batcher.close()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestMicroBatcher:
+    """Tests for the MicroBatcher class."""
+
+    async def test_concurrent_submits_share_one_flush(self, make_batcher):
+        """Should flush items submitted within the linger window together."""
+        flushed = []
+
+        async def flush(items):
+            flushed.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = make_batcher(flush, max_batch=10, linger=0.01)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        assert results == [0, 2, 4, 6, 8]
+        assert flushed == [[0, 1, 2, 3, 4]]
+
+    async def test_respects_max_batch(self, make_batcher):
+        """Should never pass more than max_batch items to a single flush."""
+        flushed = []
+
+        async def flush(items):
+            flushed.append(len(items))
+
+        batcher = make_batcher(flush, max_batch=2, linger=0.01)
+
+        await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        assert max(flushed) <= 2
+        assert sum(flushed) == 5
+
+    async def test_exception_result_is_raised_to_its_caller_only(self, make_batcher):
+        """Should raise a returned exception only for the matching item."""
+
+        async def flush(items):
+            return [ValueError(item) if item == "bad" else item for item in items]
+
+        batcher = make_batcher(flush, linger=0.01)
+
+        good, bad = await asyncio.gather(
+            batcher.submit("good"),
+            batcher.submit("bad"),
+            return_exceptions=True,
+        )
+
+        assert good == "good"
+        assert isinstance(bad, ValueError)
+
+    async def test_flush_failure_propagates_to_all_callers(self, make_batcher):
+        """Should raise the flush error to every caller in the batch."""
+
+        async def flush(items):
+            raise RuntimeError("boom")
+
+        batcher = make_batcher(flush, linger=0.01)
+
+        results = await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_close_flushes_queued_items(self, make_batcher):
+        """Should flush fire-and-forget items still queued on close."""
+        flushed = []
+
+        async def flush(items):
+            flushed.extend(items)
+
+        batcher = make_batcher(flush, linger=10.0)
+        batcher.submit_nowait("a")
+        batcher.submit_nowait("b")
+
+        await batcher.close()
+
+        assert flushed == ["a", "b"]
+
+    async def test_submit_after_close_raises(self, make_batcher):
+        """Should refuse new items once closed instead of restarting."""
+
+        async def flush(items):
+            return items
+
+        batcher = make_batcher(flush, linger=0.01)
+        await batcher.submit("a")
+        await batcher.close()
+
+        with pytest.raises(RuntimeError):
+            await batcher.submit("b")
+        with pytest.raises(RuntimeError):
+            batcher.submit_nowait("c")
@@ -0,0 +1,40 @@
+"""
+Unit tests for the TTLCache utility.
+
+Tests cover:
+  - Expiry after the TTL
+  - Least-recently-used eviction when full
+"""
+
+from unittest.mock import patch
+
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for the TTLCache class."""
+
+    def test_entry_expires_after_ttl(self):
+        """Should stop returning an entry once its TTL has passed."""
+        cache = TTLCache(maxsize=10, ttl=5.0)
+
+        with patch("app.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+            assert cache.get("key") == "value"
+
+        with patch("app.utils.cache.time.monotonic", return_value=105.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Should evict the entry that was used longest ago when full."""
+        cache = TTLCache(maxsize=2, ttl=60.0)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
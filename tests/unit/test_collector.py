@@ -3,99 +3,129 @@ Unit tests for the HTTP client (crawler).
 
 Tests cover:
   - Successful URL fetch
-  - Timeout handling
-  - Connection error handling
-  - Redirect handling
+  - HTTP status classification
+  - Timeout, connection error and redirect handling
+  - Cookies kept within one redirect chain
+  - DNS failure classification
 """
 
+import httpx
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import create_autospec, patch
 
 from app.infrastructure.crawler.http_client import fetch_url, CollectedData
-from app.core.exceptions import CollectionError
+from app.core.exceptions import (
+    CollectionError,
+    PermanentCollectionError,
+    TransientCollectionError,
+)
 
 
-@pytest.mark.asyncio
+# Built once: autospeccing httpx.AsyncClient walks its whole API
+_MOCK_CLIENT = create_autospec(httpx.AsyncClient, instance=True)
+
+
+@pytest.fixture
+def mock_httpx_client():
+    """Install an autospecced AsyncClient as the shared HTTP client."""
+    _MOCK_CLIENT.reset_mock(return_value=True, side_effect=True)
+    with patch("app.infrastructure.crawler.http_client._client", _MOCK_CLIENT):
+        yield _MOCK_CLIENT
+
+
+@pytest.mark.asyncio(loop_scope="session")
 class TestFetchUrl:
     """Tests for the fetch_url function."""
 
-    @patch("app.infrastructure.crawler.http_client.httpx.AsyncClient")
-    async def test_successful_fetch(self, mock_client_cls):
+    async def test_successful_fetch(self, mock_httpx_client):
         """Should return CollectedData with headers, cookies, and page source."""
         # Arrange
-        mock_response = MagicMock()
-        mock_response.headers = {"content-type": "text/html", "server": "nginx"}
-        mock_response.cookies = MagicMock()
-        mock_response.cookies.items.return_value = [("session", "abc123")]
-        mock_response.text = "<html><body>Hello</body></html>"
-        mock_response.status_code = 200
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
+        mock_response = httpx.Response(
+            200,
+            headers={
+                "content-type": "text/html; charset=utf-8",
+                "server": "nginx",
+                "set-cookie": "session=abc123; Path=/",
+            },
+            content="<html><body>Hello — ünïcode</body></html>".encode("utf-8"),
+            request=httpx.Request("GET", "https://example.com"),
+        )
+
+        mock_httpx_client.get.return_value = mock_response
 
         # Act
         result = await fetch_url("https://example.com")
 
         # Assert
         assert isinstance(result, CollectedData)
-        assert result.headers["content-type"] == "text/html"
+        assert result.headers["content-type"] == "text/html; charset=utf-8"
         assert result.cookies["session"] == "abc123"
-        assert "Hello" in result.page_source
+        assert "Hello — ünïcode" in result.page_source
         assert result.status_code == 200
 
-    @patch("app.infrastructure.crawler.http_client.httpx.AsyncClient")
-    async def test_timeout_raises_collection_error(self, mock_client_cls):
-        """Should raise CollectionError on request timeout."""
-        import httpx
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(
-            side_effect=httpx.TimeoutException("Connection timed out")
+    @pytest.mark.parametrize(
+        "status_code, expected_error",
+        [
+            (404, PermanentCollectionError),
+            (451, PermanentCollectionError),
+            (429, TransientCollectionError),
+            (503, TransientCollectionError),
+        ],
+    )
+    async def test_error_status_is_classified(
+        self, mock_httpx_client, status_code, expected_error
+    ):
+        """Should map error status codes to permanent or transient failures."""
+        mock_httpx_client.get.return_value = httpx.Response(
+            status_code, request=httpx.Request("GET", "https://example.com")
         )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        with pytest.raises(CollectionError) as exc_info:
-            await fetch_url("https://slow-site.com")
+        with pytest.raises(expected_error):
+            await fetch_url("https://example.com")
+
+    @pytest.mark.parametrize(
+        "exc, fragment",
+        [
+            (httpx.TimeoutException("Connection timed out"), "timed out"),
+            (httpx.ConnectError("Connection refused"), "connection failed"),
+            (httpx.TooManyRedirects("Too many redirects"), "redirect"),
+        ],
+    )
+    async def test_fetch_url_raises(self, mock_httpx_client, exc, fragment):
+        """Should raise CollectionError on timeouts, connection failures and redirect loops."""
+        mock_httpx_client.get.side_effect = exc
 
-        assert "timed out" in exc_info.value.message.lower()
+        with pytest.raises(CollectionError) as exc_info:
+            await fetch_url("https://example.com")
 
-    @patch("app.infrastructure.crawler.http_client.httpx.AsyncClient")
-    async def test_connection_error_raises_collection_error(self, mock_client_cls):
-        """Should raise CollectionError on connection failure."""
-        import httpx
+        assert fragment in exc_info.value.message.lower()
 
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(
-            side_effect=httpx.ConnectError("Connection refused")
+    async def test_dns_failure_is_permanent(self, mock_httpx_client):
+        """Should raise PermanentCollectionError when the domain does not resolve."""
+        mock_httpx_client.get.side_effect = httpx.ConnectError(
+            "[Errno -2] Name or service not known"
         )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
-
-        with pytest.raises(CollectionError) as exc_info:
-            await fetch_url("https://down-site.com")
 
-        assert "connection failed" in exc_info.value.message.lower()
+        with pytest.raises(PermanentCollectionError) as exc_info:
+            await fetch_url("https://no-such-domain.invalid")
 
-    @patch("app.infrastructure.crawler.http_client.httpx.AsyncClient")
-    async def test_too_many_redirects(self, mock_client_cls):
-        """Should raise CollectionError on redirect loops."""
-        import httpx
+        assert "dns resolution failed" in exc_info.value.message.lower()
 
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(
-            side_effect=httpx.TooManyRedirects("Too many redirects")
+    async def test_cookies_carried_across_redirects(self, mock_httpx_client):
+        """Should replay cookies set earlier in a redirect chain."""
+        redirect = httpx.Response(
+            302,
+            headers={"location": "/home", "set-cookie": "session=abc; Path=/"},
+            request=httpx.Request("GET", "https://example.com/login"),
+        )
+        redirect.next_request = httpx.Request("GET", "https://example.com/home")
+        mock_httpx_client.get.return_value = redirect
+        mock_httpx_client.send.return_value = httpx.Response(
+            200, text="home", request=redirect.next_request
         )
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
 
-        with pytest.raises(CollectionError) as exc_info:
-            await fetch_url("https://loop-site.com")
+        result = await fetch_url("https://example.com/login")
 
-        assert "redirect" in exc_info.value.message.lower()
+        assert result.status_code == 200
+        sent = mock_httpx_client.send.call_args.args[0]
+        assert sent.headers["cookie"] == "session=abc"
@@ -0,0 +1,98 @@
+"""
+Unit tests for the Kafka consumer's offset tracking.
+
+Tests cover:
+  - Only contiguous finished offsets become committable
+  - Revoked partitions are forgotten
+  - The consume thread pauses and resumes instead of blocking
+  - A failed consume thread wakes the event loop
+"""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from confluent_kafka import TopicPartition
+
+from app.core.config import settings
+from app.infrastructure.messaging.consumer import (
+    _Backlog,
+    _consume_thread,
+    _OffsetTracker,
+)
+
+
+class TestOffsetTracker:
+    """Tests for the _OffsetTracker class."""
+
+    def test_commits_highest_contiguous_offset(self):
+        """Should hold back offsets past a message that is still in flight."""
+        tracker = _OffsetTracker()
+        for offset in (10, 11, 12):
+            tracker.track("tasks", 0, offset)
+
+        tracker.finish("tasks", 0, 12)
+        assert not tracker
+
+        tracker.finish("tasks", 0, 10)
+        [committed] = tracker.take_committable()
+        assert committed.offset == 11
+
+        tracker.finish("tasks", 0, 11)
+        [committed] = tracker.take_committable()
+        assert committed.offset == 13
+
+    def test_ignores_revoked_partitions(self):
+        """Should not report offsets for a partition that was revoked."""
+        tracker = _OffsetTracker()
+        tracker.track("tasks", 1, 5)
+
+        tracker.forget([TopicPartition("tasks", 1)])
+        tracker.finish("tasks", 1, 5)
+
+        assert tracker.take_committable() == []
+
+
+class TestConsumeThread:
+    """Tests for the _consume_thread backpressure."""
+
+    def test_pauses_and_resumes_while_still_consuming(self):
+        """Should keep calling consume() while paused, resuming once drained."""
+        backlog = _Backlog()
+        backlog.add(10)
+        stop = threading.Event()
+        consumer = MagicMock()
+        consumer.assignment.return_value = [TopicPartition("tasks", 0)]
+
+        def consume(num_messages, timeout):
+            if consumer.consume.call_count == 1:
+                backlog.done(10)
+            else:
+                stop.set()
+            return []
+
+        consumer.consume.side_effect = consume
+        loop = asyncio.new_event_loop()
+        try:
+            with patch.object(settings, "kafka_max_outstanding_messages", 10):
+                _consume_thread(consumer, loop, asyncio.Queue(), backlog, stop)
+        finally:
+            loop.close()
+
+        assert consumer.consume.call_count == 2
+        consumer.pause.assert_called_once_with([TopicPartition("tasks", 0)])
+        consumer.resume.assert_called_once_with([TopicPartition("tasks", 0)])
+
+    def test_failure_is_handed_to_the_loop(self):
+        """Should pass the thread's exception to the loop in place of a batch."""
+        consumer = MagicMock()
+        consumer.consume.side_effect = RuntimeError("broker gone")
+        handoff = asyncio.Queue()
+        loop = asyncio.new_event_loop()
+        try:
+            _consume_thread(consumer, loop, handoff, _Backlog(), threading.Event())
+            item = loop.run_until_complete(handoff.get())
+        finally:
+            loop.close()
+
+        assert isinstance(item, RuntimeError)
@@ -5,63 +5,60 @@ Tests cover:
   - create_metadata: successful collection and storage
   - get_metadata: cache hit behaviour
   - get_metadata: cache miss with background scheduling
+  - get_metadata: single-flight scheduling for concurrent misses
+  - get_metadata: a failed enqueue releases the pending record
+  - drain_background_tasks: shutdown waits for scheduled collections
 """
 
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from datetime import datetime, timezone
 
+from app.core.exceptions import CollectionError
+from app.domain import metadata_service
 from app.domain.metadata_service import MetadataService
-from app.infrastructure.crawler.http_client import CollectedData
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestCreateMetadata:
     """Tests for MetadataService.create_metadata()."""
 
-    async def test_create_metadata_success(self, mock_repository, sample_metadata_doc):
+    async def test_create_metadata_success(
+        self, mock_repository, sample_metadata_doc, sample_collected
+    ):
         """Should fetch URL, upsert to DB, and return the complete record."""
         # Arrange
-        service = MetadataService(repository=mock_repository)
-        mock_repository.upsert = AsyncMock(return_value="mock_id_123")
-        mock_repository.find_by_url = AsyncMock(return_value=sample_metadata_doc)
-
-        mock_collected = CollectedData(
-            headers={"content-type": "text/html"},
-            cookies={},
-            page_source="<html>Test</html>",
-            status_code=200,
+        service = MetadataService(
+            repository=mock_repository,
+            fetcher=AsyncMock(return_value=sample_collected),
         )
+        mock_repository.upsert_returning.return_value = sample_metadata_doc
 
-        with patch(
-            "app.domain.metadata_service.fetch_url",
-            new_callable=AsyncMock,
-            return_value=mock_collected,
-        ):
-            # Act
-            result = await service.create_metadata("https://example.com")
+        # Act
+        result = await service.create_metadata("https://example.com")
 
         # Assert
         assert result.url == "https://example.com/"
         assert result.status == "completed"
-        mock_repository.upsert.assert_called_once()
+        mock_repository.upsert_returning.assert_called_once()
+        mock_repository.find_by_url.assert_not_called()
 
     async def test_create_metadata_fetch_failure(self, mock_repository):
         """Should propagate CollectionError when fetch fails."""
-        from app.core.exceptions import CollectionError
-
-        service = MetadataService(repository=mock_repository)
+        service = MetadataService(
+            repository=mock_repository,
+            fetcher=AsyncMock(
+                side_effect=CollectionError("https://bad.com", "Connection refused")
+            ),
+        )
 
-        with patch(
-            "app.domain.metadata_service.fetch_url",
-            new_callable=AsyncMock,
-            side_effect=CollectionError("https://bad.com", "Connection refused"),
-        ):
-            with pytest.raises(CollectionError):
-                await service.create_metadata("https://bad.com")
+        with pytest.raises(CollectionError):
+            await service.create_metadata("https://bad.com")
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 class TestGetMetadata:
     """Tests for MetadataService.get_metadata()."""
 
@@ -70,7 +67,8 @@ class TestGetMetadata:
     ):
         """Should return the existing record on cache hit."""
         service = MetadataService(repository=mock_repository)
-        mock_repository.find_by_url = AsyncMock(return_value=sample_metadata_doc)
+        mock_repository.find_status.return_value = "completed"
+        mock_repository.find_by_url.return_value = sample_metadata_doc
 
         record, found = await service.get_metadata("https://example.com")
 
@@ -79,39 +77,103 @@ class TestGetMetadata:
         assert record.url == "https://example.com/"
         assert record.status == "completed"
 
-    async def test_get_metadata_cache_miss(self, mock_repository):
+    async def test_get_metadata_cache_miss(self, monkeypatch, mock_repository):
         """Should return None and schedule background collection on miss."""
         service = MetadataService(repository=mock_repository)
-        mock_repository.find_by_url = AsyncMock(return_value=None)
-        mock_repository.mark_pending = AsyncMock(return_value=True)
+        mock_repository.find_status.return_value = None
+        mock_repository.mark_pending.return_value = True
+        mock_enqueue = AsyncMock()
+        monkeypatch.setattr(metadata_service, "enqueue", mock_enqueue)
 
-        with patch(
-            "app.domain.metadata_service.enqueue", new_callable=AsyncMock
-        ) as mock_enqueue:
-            record, found = await service.get_metadata("https://unknown.com")
+        record, found = await service.get_metadata("https://unknown.com")
+        await asyncio.gather(*metadata_service._background_tasks)
 
         assert found is False
         assert record is None
+        mock_repository.find_by_url.assert_not_called()
         mock_repository.mark_pending.assert_called_once()
         mock_enqueue.assert_called_once()
 
-    async def test_get_metadata_pending_not_re_enqueued(self, mock_repository):
-        """Should not re-enqueue a URL that is already pending."""
+    async def test_concurrent_misses_schedule_once(self, monkeypatch, mock_repository):
+        """Should schedule a single collection for concurrent misses on a URL."""
         service = MetadataService(repository=mock_repository)
+        mock_repository.find_status.return_value = None
+        mock_repository.mark_pending.return_value = True
+        mock_enqueue = AsyncMock()
+        monkeypatch.setattr(metadata_service, "enqueue", mock_enqueue)
 
-        pending_doc = {
-            "_id": "some_id",
-            "url": "https://pending.com/",
-            "status": "pending",
-        }
-        mock_repository.find_by_url = AsyncMock(return_value=pending_doc)
-        mock_repository.mark_pending = AsyncMock(return_value=False)
+        results = await asyncio.gather(
+            *(service.get_metadata("https://hot.com") for _ in range(10))
+        )
+        await asyncio.gather(*metadata_service._background_tasks)
 
-        with patch(
-            "app.domain.metadata_service.enqueue", new_callable=AsyncMock
-        ) as mock_enqueue:
-            record, found = await service.get_metadata("https://pending.com")
+        assert all(found is False for _, found in results)
+        mock_repository.mark_pending.assert_called_once()
+        mock_enqueue.assert_called_once()
+
+    async def test_get_metadata_pending_not_re_enqueued(
+        self, monkeypatch, mock_repository
+    ):
+        """Should not re-enqueue a URL that is already pending."""
+        service = MetadataService(repository=mock_repository)
+        mock_repository.find_status.return_value = "pending"
+        mock_repository.mark_pending.return_value = False
+        mock_enqueue = AsyncMock()
+        monkeypatch.setattr(metadata_service, "enqueue", mock_enqueue)
+
+        record, found = await service.get_metadata("https://pending.com")
+        await asyncio.gather(*metadata_service._background_tasks)
 
         assert found is False
+        mock_repository.mark_pending.assert_called_once()
         # Should not enqueue since mark_pending returned False
         mock_enqueue.assert_not_called()
+
+    async def test_enqueue_failure_releases_pending_record(
+        self, monkeypatch, mock_repository
+    ):
+        """Should mark the URL failed when it was marked pending but not enqueued."""
+        service = MetadataService(repository=mock_repository)
+        mock_repository.find_status.return_value = None
+        mock_repository.mark_pending.return_value = True
+        monkeypatch.setattr(
+            metadata_service, "enqueue", AsyncMock(side_effect=RuntimeError("closed"))
+        )
+
+        await service.get_metadata("https://unlucky.com")
+        await asyncio.gather(*metadata_service._background_tasks)
+
+        mock_repository.mark_failed.assert_called_once()
+        assert mock_repository.mark_failed.call_args.args[0] == "https://unlucky.com/"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestDrainBackgroundTasks:
+    """Tests for drain_background_tasks()."""
+
+    async def test_waits_for_scheduled_collections(self, monkeypatch, mock_repository):
+        """Should let in-flight scheduling finish enqueueing before returning."""
+        service = MetadataService(repository=mock_repository)
+        mock_repository.mark_pending.return_value = True
+        enqueued = []
+
+        async def slow_enqueue(url):
+            await asyncio.sleep(0.01)
+            enqueued.append(url)
+
+        monkeypatch.setattr(metadata_service, "enqueue", slow_enqueue)
+
+        await service.get_metadata("https://draining.com")
+        await metadata_service.drain_background_tasks(timeout=1.0)
+
+        assert enqueued == ["https://draining.com/"]
+
+    async def test_cancels_tasks_past_the_timeout(self):
+        """Should cancel tasks still running once the timeout expires."""
+        task = asyncio.create_task(asyncio.sleep(10))
+        metadata_service._background_tasks.add(task)
+        task.add_done_callback(metadata_service._background_tasks.discard)
+
+        await metadata_service.drain_background_tasks(timeout=0.01)
+
+        assert task.cancelled()
@@ -0,0 +1,86 @@
+"""
+Unit tests for the Kafka producer's message encoding.
+
+Tests cover:
+  - Task and retry messages built from byte templates match orjson output
+  - URLs are sent as given, never re-normalised
+  - Duplicate URLs in one enqueue window produce one message
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from app.infrastructure.messaging import producer
+from app.infrastructure.messaging.producer import _encode_retry, _encode_task, enqueue
+from app.utils.batching import MicroBatcher
+
+
+URLS = [
+    "https://example.com/",
+    "https://example.com/search?a=1&b=2",
+    "https://bücher.example/straße",
+    'https://example.com/"quoted"',
+    "https://example.com/back\\slash",
+    "https://example.com/\x01control",
+]
+
+# URLs the normaliser would rewrite, which must be sent unchanged
+UNNORMALISED_URLS = [
+    "https://Example.com/A/?b=1&a=2",
+    "https://::1:8080/x",
+    "http://[::1]:8080/x",
+]
+
+
+class TestEncodeTask:
+    """Tests for the _encode_task helper."""
+
+    @pytest.mark.parametrize("url", URLS + UNNORMALISED_URLS)
+    def test_matches_orjson(self, url):
+        """Should produce exactly the bytes orjson would."""
+        assert _encode_task(url) == orjson.dumps({"url": url})
+
+
+class TestEncodeRetry:
+    """Tests for the _encode_retry helper."""
+
+    @pytest.mark.parametrize("url", URLS + UNNORMALISED_URLS)
+    def test_matches_orjson(self, url):
+        """Should produce exactly the bytes orjson would."""
+        assert _encode_retry(url, 2) == orjson.dumps({"url": url, "retry_count": 2})
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestEnqueue:
+    """Tests for enqueue() coalescing."""
+
+    async def test_duplicate_urls_share_one_message(self, monkeypatch):
+        """Should produce once per distinct URL and report errors to every caller."""
+        mock_producer = MagicMock()
+
+        def produce(topic, value, callback):
+            if b"full.com" in value:
+                raise BufferError("queue full")
+
+        mock_producer.produce.side_effect = produce
+        batcher = MicroBatcher(producer._produce_enqueued, linger=0.01)
+        monkeypatch.setattr(producer, "_producer", mock_producer)
+        monkeypatch.setattr(producer, "_enqueue_batcher", batcher)
+
+        try:
+            results = await asyncio.gather(
+                enqueue("https://a.com/"),
+                enqueue("https://a.com/"),
+                enqueue("https://full.com/"),
+                enqueue("https://full.com/"),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.close()
+
+        assert mock_producer.produce.call_count == 2
+        assert results[:2] == [None, None]
+        assert all(isinstance(r, BufferError) for r in results[2:])
@@ -0,0 +1,174 @@
+"""
+Unit tests for the MetadataRepository.
+
+Tests cover:
+  - mark_pending: concurrent marks merged into one bulk write
+  - mark_pending: duplicate-key outcomes reported as already pending
+  - upsert: _id returned from a single findAndModify round-trip
+  - upsert_batched: concurrent upserts merged into one bulk write
+  - upsert_batched: a failed write reported to its caller only
+  - read cache: completed records served without a round-trip
+  - read cache: writes invalidate the cached record
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo.errors import BulkWriteError
+
+from app.core.exceptions import DatabaseError
+from app.infrastructure.db.repository import MetadataRepository
+
+
+@pytest_asyncio.fixture
+async def repo():
+    """Provide a MetadataRepository, flushing its batchers on teardown."""
+    repository = MetadataRepository()
+    yield repository
+    await repository.close()
+
+
+@pytest.fixture
+def mock_collection():
+    """Patch the database handle and yield the metadata collection mock."""
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock()
+    collection.find_one_and_update = AsyncMock()
+    collection.find_one = AsyncMock()
+    with patch("app.infrastructure.db.repository.get_database") as mock_db:
+        mock_db.return_value.__getitem__ = MagicMock(return_value=collection)
+        yield collection
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestMarkPending:
+    """Tests for MetadataRepository.mark_pending()."""
+
+    async def test_concurrent_marks_share_one_bulk_write(self, repo, mock_collection):
+        """Should merge concurrent marks into a single unordered bulk write."""
+        results = await asyncio.gather(
+            repo.mark_pending("https://a.com/"),
+            repo.mark_pending("https://b.com/"),
+            repo.mark_pending("https://a.com/"),
+        )
+
+        assert results == [True, True, False]
+        mock_collection.bulk_write.assert_called_once()
+        operations = mock_collection.bulk_write.call_args.args[0]
+        assert len(operations) == 2
+        assert mock_collection.bulk_write.call_args.kwargs["ordered"] is False
+        assert all(op._hint == "idx_url_unique" for op in operations)
+
+    async def test_duplicate_key_means_already_pending(self, repo, mock_collection):
+        """Should report False for URLs whose upsert hit the unique index."""
+        mock_collection.bulk_write.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "dup"}]}
+        )
+
+        results = await asyncio.gather(
+            repo.mark_pending("https://new.com/"),
+            repo.mark_pending("https://existing.com/"),
+        )
+
+        assert results == [True, False]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestUpsert:
+    """Tests for MetadataRepository.upsert()."""
+
+    async def test_returns_id_in_one_round_trip(self, repo, mock_collection):
+        """Should read the _id back from findAndModify without a second query."""
+        mock_collection.find_one_and_update.return_value = {"_id": "abc123"}
+
+        doc_id = await repo.upsert("https://example.com/", {"headers": {}})
+
+        assert doc_id == "abc123"
+        assert mock_collection.find_one_and_update.call_args.kwargs["projection"] == {"_id": 1}
+        mock_collection.find_one.assert_not_called()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestUpsertBatched:
+    """Tests for MetadataRepository.upsert_batched()."""
+
+    async def test_concurrent_upserts_share_one_bulk_write(
+        self, repo, mock_collection
+    ):
+        """Should merge concurrent upserts, writing the latest payload per URL."""
+        await asyncio.gather(
+            repo.upsert_batched("https://a.com/", {"status_code": 500}),
+            repo.upsert_batched("https://b.com/", {"status_code": 200}),
+            repo.upsert_batched("https://a.com/", {"status_code": 200}),
+        )
+
+        mock_collection.bulk_write.assert_called_once()
+        operations = mock_collection.bulk_write.call_args.args[0]
+        assert len(operations) == 2
+        assert operations[0]._doc["$set"]["status_code"] == 200
+
+    async def test_failed_write_raises_for_its_url_only(
+        self, repo, mock_collection
+    ):
+        """Should raise DatabaseError only to the caller whose write failed."""
+        mock_collection.bulk_write.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 2, "errmsg": "bad"}]}
+        )
+
+        results = await asyncio.gather(
+            repo.upsert_batched("https://a.com/", {}),
+            repo.upsert_batched("https://b.com/", {}),
+            return_exceptions=True,
+        )
+
+        assert results[0] is None
+        assert isinstance(results[1], DatabaseError)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestReadCache:
+    """Tests for the repository's completed-record read cache."""
+
+    async def test_completed_record_served_from_cache(self, repo, mock_collection):
+        """Should answer repeat lookups of a completed record from memory."""
+        mock_collection.find_one.return_value = {
+            "_id": "abc123",
+            "url": "https://example.com/",
+            "status": "completed",
+        }
+
+        first = await repo.find_by_url("https://example.com/")
+        second = await repo.find_by_url("https://example.com/")
+        status = await repo.find_status("https://example.com/")
+
+        assert first is second
+        assert status == "completed"
+        mock_collection.find_one.assert_called_once()
+
+    async def test_pending_record_not_cached(self, repo, mock_collection):
+        """Should re-read records that are still pending."""
+        mock_collection.find_one.return_value = {
+            "url": "https://example.com/",
+            "status": "pending",
+        }
+
+        await repo.find_by_url("https://example.com/")
+        await repo.find_by_url("https://example.com/")
+
+        assert mock_collection.find_one.call_count == 2
+
+    async def test_mark_failed_invalidates_cache(self, repo, mock_collection):
+        """Should drop the cached record when the URL is written to."""
+        mock_collection.find_one.return_value = {
+            "url": "https://example.com/",
+            "status": "completed",
+        }
+        mock_collection.update_one = AsyncMock()
+
+        await repo.find_by_url("https://example.com/")
+        await repo.mark_failed("https://example.com/", "gone")
+        await repo.find_by_url("https://example.com/")
+
+        assert mock_collection.find_one.call_count == 2